@@ -1,12 +1,27 @@
+import hashlib
 import logging
 import math
+import os
+import platform
+import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.models import Article
 from app.schemas import ArticleIngest
 
+try:
+    from numba import njit  # compiles the weighting kernel below to machine code
+except ImportError:  # optional — the NumPy reduction is used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -28,6 +43,46 @@ LABEL_WEIGHTS: dict[str, float] = {
 #   - 1.0 → article is purely a cybersecurity/outage event (highest weight)
 IMPORTANCE_THRESHOLD = 0.5  # minimum importance_score to mark is_filtered = True
 
+# Canonical label order and the matching weight vector, so scoring is a single vector product
+_LABELS = list(LABEL_WEIGHTS.keys())
+_LABEL_TO_ID = {label: i for i, label in enumerate(_LABELS)}  # label → index into _LABELS / _WEIGHTS
+_WEIGHTS = np.array([LABEL_WEIGHTS[label] for label in _LABELS], dtype=np.float32)
+
+
+def _reduce_kernel(scores, positions, weights):
+    """
+    Weigh each row of confidences and reduce it to (importance_score, category index).
+    positions[i, j] is the canonical index of the label scores[i, j] belongs to.
+    Plain loops over typed arrays, so Numba can compile it without Python objects.
+    """
+    n_rows, n_labels = scores.shape
+    totals = np.empty(n_rows, dtype=np.float64)
+    categories = np.empty(n_rows, dtype=np.int64)
+    for i in range(n_rows):
+        total = 0.0
+        best = -1.0
+        category = 0
+        for j in range(n_labels):
+            weighted = scores[i, j] * weights[positions[i, j]]
+            total += weighted
+            if weighted > best:
+                best = weighted
+                category = positions[i, j]
+        totals[i] = total
+        categories[i] = category
+    return totals, categories
+
+
+def _reduce_numpy(scores, positions, weights):
+    """Vectorised equivalent of _reduce_kernel, used when Numba is not installed."""
+    weighted = scores * weights[positions]  # confidence × weight, per text and label
+    best = weighted.argmax(axis=1)
+    return weighted.sum(axis=1), np.take_along_axis(positions, best[:, None], axis=1)[:, 0]
+
+
+# cache=True keeps the compiled kernel on disk (__pycache__), so only the first start pays for it
+_reduce = njit(cache=True)(_reduce_kernel) if njit is not None else _reduce_numpy
+
 # ---------------------------------------------------------------------------
 # Recency decay — exponential decay with 48h half-life
 # λ = ln(2) / half_life_hours
@@ -36,6 +91,241 @@ IMPORTANCE_THRESHOLD = 0.5  # minimum importance_score to mark is_filtered = Tru
 RECENCY_HALF_LIFE_HOURS = 48
 RECENCY_LAMBDA = math.log(2) / RECENCY_HALF_LIFE_HOURS  # ≈ 0.0144
 
+# Decay precomputed per quarter hour for the first 30 days, so scoring is a table lookup instead
+# of an exp() per article. Rounding to the nearest 15 min shifts a score by at most ~0.2%;
+# anything older is clamped to the last entry (≈ 3e-5, effectively zero).
+RECENCY_LUT_STEPS_PER_HOUR = 4
+RECENCY_LUT_MAX_HOURS = 24 * 30
+_RECENCY_LUT = np.exp(
+    -RECENCY_LAMBDA * np.arange(RECENCY_LUT_MAX_HOURS * RECENCY_LUT_STEPS_PER_HOUR) / RECENCY_LUT_STEPS_PER_HOUR
+)
+
+
+def _as_utc(published_at: datetime) -> datetime:
+    """
+    Publication time as an aware UTC datetime. Aware values in any zone are converted; naive
+    values are taken as UTC, which is what the naive DB column stores (ArticleIngest normalises
+    every incoming published_at to UTC before it is saved).
+    """
+    return published_at.astimezone(timezone.utc) if published_at.tzinfo else published_at.replace(tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Model — served as a dynamically quantized INT8 ONNX export when optimum is installed
+# ---------------------------------------------------------------------------
+
+MODEL_ID = "valhalla/distilbart-mnli-12-3"
+
+# The export + quantization runs once; later startups load the artifact from here.
+# Each instruction-set target gets its own subdirectory (see _quantization_target).
+QUANTIZED_MODEL_DIR = os.getenv(
+    "QUANTIZED_MODEL_DIR",
+    os.path.join(
+        os.getenv("HF_HOME", os.path.expanduser("~/.cache/huggingface")),
+        "onnx-int8",
+        MODEL_ID.replace("/", "--"),
+    ),
+)
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def _cpu_flags() -> set[str]:
+    """CPU feature flags from /proc/cpuinfo (Linux); empty where unavailable."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def _quantization_target() -> str:
+    """
+    Pick the optimum AutoQuantizationConfig preset matching this CPU: VNNI int8 dot-product
+    instructions when present, otherwise plain AVX-512 / AVX2, and the ARM64 preset on ARM.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+# Token cap per premise/hypothesis pair. Title + 300-char snippet + label fits comfortably;
+# only the premise is truncated (the pipeline tokenizes with ONLY_FIRST), never the label.
+MAX_SEQUENCE_LENGTH = 128
+
+# Dummy input classified once by load(), so the first real request doesn't pay the cold-start cost
+WARMUP_TEXT = "Warmup: critical vulnerability patched after a service outage"
+
+# Number of premise/hypothesis pairs fed to the model per forward pass in batched calls.
+# Zero-shot NLI expands every text into one pair per label; a multiple of the label count keeps
+# each text's pairs in the same forward pass instead of splitting them across two.
+CLASSIFY_BATCH_SIZE = 5 * len(_LABELS)
+
+# Max number of (importance_score, category) results kept in the in-memory LRU cache.
+# RSS feeds redeliver the same items every cycle, so repeated texts skip inference entirely.
+CLASSIFICATION_CACHE_SIZE = 4096
+
+# Optional keyword prefilter (off by default, enable with KEYWORD_PREFILTER=1). Texts that mention
+# none of these high-signal terms skip the model and are scored as pure general technology news.
+# Trades a small false-negative rate for throughput on the long tail of uninteresting headlines.
+KEYWORD_PREFILTER = os.getenv("KEYWORD_PREFILTER", "").lower() in ("1", "true", "yes")
+_HIGH_SIGNAL_RE = re.compile(
+    r"\b(?:outage|breach\w*|ransomware|malware|phishing|vulnerab\w*|vuln|zero[- ]?day|cve-\d{4}-\d+"
+    r"|exploit\w*|down|downtime|crash\w*|leak\w*|patch\w*|kernel|rce|hack\w*|attack\w*|disruption)\b",
+    re.IGNORECASE,
+)
+_PREFILTERED_RESULT = (LABEL_WEIGHTS["general technology news"], "general technology news")
+
+
+# ---------------------------------------------------------------------------
+# Bulk upsert — one executemany INSERT ... ON CONFLICT DO UPDATE per batch instead of a merge per article
+# ---------------------------------------------------------------------------
+
+_INSERT_BY_DIALECT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Columns overwritten when the article ID already exists; ingested_at keeps its original value
+_UPSERT_COLUMNS = (
+    "source", "title", "body", "published_at", "url",
+    "importance_score", "is_filtered", "category",
+)
+
+
+def _upsert_articles(articles: list[Article], db: Session) -> None:
+    """Insert or update all articles in a single statement. The caller is responsible for committing."""
+    now = datetime.now(timezone.utc)
+    # Last occurrence wins if the batch repeats an ID — ON CONFLICT cannot touch a row twice
+    rows = {
+        a.id: {"id": a.id, "ingested_at": now, **{col: getattr(a, col) for col in _UPSERT_COLUMNS}}
+        for a in articles
+    }
+
+    insert = _INSERT_BY_DIALECT[db.get_bind().dialect.name]
+    stmt = insert(Article)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Article.id],
+        set_={col: stmt.excluded[col] for col in _UPSERT_COLUMNS},
+    )
+    # executemany form: the statement text is the same for every batch size, so it is compiled once and
+    # cached, and SQLAlchemy's insertmanyvalues still sends the rows as batched multi-row VALUES
+    db.execute(stmt, list(rows.values()))
+
+
+def _load_quantized_pipeline(model_id: str):
+    """
+    Build the pipeline for model_id on an INT8 dynamically quantized ONNX Runtime model, quantized for this CPU.
+    The quantized artifact is cached in QUANTIZED_MODEL_DIR/<target> so export + quantization only happen once.
+    Raises ImportError if optimum / onnxruntime are not installed.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from optimum.pipelines import pipeline
+    from transformers import AutoTokenizer
+
+    from app.zero_shot import CachedHypothesisZeroShotPipeline
+
+    target = _quantization_target()
+    model_dir = os.path.join(QUANTIZED_MODEL_DIR, target)
+
+    if not os.path.exists(os.path.join(model_dir, QUANTIZED_MODEL_FILE)):
+        logger.info(f"Exporting '{model_id}' to ONNX and quantizing to INT8 for {target} (first run only)...")
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_id, export=True, provider="CPUExecutionProvider",
+        )
+        quantization_config = getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=True)
+        ORTQuantizer.from_pretrained(model).quantize(
+            save_dir=model_dir, quantization_config=quantization_config,
+        )
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(model_dir)
+
+    model = ORTModelForSequenceClassification.from_pretrained(
+        model_dir, file_name=QUANTIZED_MODEL_FILE, provider="CPUExecutionProvider",
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline(
+        "zero-shot-classification", model=model, tokenizer=tokenizer, accelerator="ort",
+        pipeline_class=CachedHypothesisZeroShotPipeline,
+    )
+
+
+def _accelerator():
+    """
+    (device, dtype) for a local GPU, CUDA first and then Apple-Silicon MPS, or None on CPU-only hosts.
+    Both run the model in float16, which halves memory traffic at no cost to the ranking.
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    if torch.cuda.is_available():
+        return "cuda", torch.float16
+    if torch.backends.mps.is_available():
+        return "mps", torch.float16
+    return None
+
+
+def _load_torch_pipeline(model_id: str, device=None, dtype=None):
+    """
+    Build the PyTorch pipeline for model_id. device / dtype are only passed on when given,
+    so the CPU path loads exactly as transformers' own defaults would.
+    """
+    from transformers import pipeline  # imported here to defer heavy load
+
+    from app.zero_shot import CachedHypothesisZeroShotPipeline
+    placement = {name: value for name, value in (("device", device), ("dtype", dtype)) if value is not None}
+    return pipeline(
+        "zero-shot-classification", model=model_id, pipeline_class=CachedHypothesisZeroShotPipeline, **placement,
+    )
+
+
+# Held while the model loads — load()'s thread, the fetcher and /ingest can all ask for it first
+_PIPELINE_LOCK = threading.Lock()
+
+
+def _load_pipeline(model_id: str):
+    """
+    Return the zero-shot classification pipeline for model_id, loading it on the first call.
+    Concurrent first calls wait on _PIPELINE_LOCK for a single load instead of each loading the model
+    (and, on the ONNX path, exporting into the same QUANTIZED_MODEL_DIR).
+    """
+    with _PIPELINE_LOCK:
+        return _build_pipeline(model_id)
+
+
+@lru_cache(maxsize=1)
+def _build_pipeline(model_id: str):
+    """
+    Build the zero-shot classification pipeline for model_id, once per process. Call via _load_pipeline.
+    Every ClassifierService shares the result, so extra instances never reload the model.
+    A local GPU gets the FP16 PyTorch model; on CPU the INT8 ONNX model is preferred over FP32.
+    """
+    logger.info("Loading zero-shot classification model (first use — this may take a moment)...")
+    accelerator = _accelerator()
+    if accelerator is not None:
+        device, dtype = accelerator
+        logger.info(f"Running the model on {device} in {dtype}")
+        pipe = _load_torch_pipeline(model_id, device=device, dtype=dtype)
+    else:
+        try:
+            pipe = _load_quantized_pipeline(model_id)
+        except ImportError:
+            logger.warning("optimum[onnxruntime] is not installed — falling back to the FP32 PyTorch model")
+            pipe = _load_torch_pipeline(model_id)
+    # The zero-shot call takes no tokenizer kwargs; it truncates to the tokenizer's model_max_length
+    pipe.tokenizer.model_max_length = MAX_SEQUENCE_LENGTH
+    # Sequence classification never reuses past key/values — don't let the model build them
+    pipe.model.config.use_cache = False
+    logger.info("Model loaded successfully")
+    return pipe
+
 
 class ClassifierService:
     """
@@ -43,13 +333,22 @@ class ClassifierService:
     The model is loaded lazily on the first classification call.
     """
 
-    def __init__(self):
-        self._pipeline = None
+    def __init__(self, keyword_prefilter: bool = KEYWORD_PREFILTER):
         self._ready = False
+        self.keyword_prefilter = keyword_prefilter
+        # sha1(text) → (importance_score, category), least recently used first
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._cache_lock = threading.Lock()  # fetcher thread and /ingest requests share the singleton
 
     def load(self):
-        """Eagerly load the model. Call at startup to avoid a slow first request."""
-        self._get_pipeline()
+        """
+        Eagerly load the model and run one warmup inference. Call at startup to avoid a slow first request.
+        The first forward pass pays one-off costs (weight materialization, kernel selection), so it is
+        run here, before is_ready flips, rather than on the first real article.
+        """
+        pipe = self._get_pipeline()
+        # bypasses the result cache on purpose; same call shape as _compute_importance
+        pipe([WARMUP_TEXT], candidate_labels=_LABELS, batch_size=len(_LABELS))
         self._ready = True
 
     @property
@@ -57,16 +356,59 @@ class ClassifierService:
         return self._ready
 
     def _get_pipeline(self):
-        """Load and cache the zero-shot classification pipeline on first call."""
-        if self._pipeline is None:
-            from transformers import pipeline  # imported here to defer heavy load
-            logger.info("Loading zero-shot classification model (first use — this may take a moment)...")
-            self._pipeline = pipeline(
-                "zero-shot-classification",
-                model="valhalla/distilbart-mnli-12-3",
-            )
-            logger.info("Model loaded successfully")
-        return self._pipeline
+        """Return the process-wide zero-shot classification pipeline, loading it on first call."""
+        return _load_pipeline(MODEL_ID)
+
+    @staticmethod
+    def _build_text(title: str, body: str | None = None) -> str:
+        """Combine the title with a short body snippet into the text fed to the model."""
+        body_snippet = (body or "")[:300].strip()
+        return f"{title}. {body_snippet}" if body_snippet else title
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> tuple[float, str] | None:
+        """Return the cached result for key (marking it most recently used), or None."""
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: str, result: tuple[float, str]) -> None:
+        """Store a result, evicting the least recently used entry when the cache is full."""
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > CLASSIFICATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _weigh(result: dict) -> tuple[float, str]:
+        """Turn one pipeline result into (importance_score, category) using LABEL_WEIGHTS."""
+        return ClassifierService._weigh_batch([result])[0]
+
+    @staticmethod
+    def _weigh_batch(results: list[dict]) -> list[tuple[float, str]]:
+        """
+        Turn a batch of pipeline results into (importance_score, category) tuples.
+        Scores are gathered into one (n_texts, n_labels) matrix and reduced by _reduce,
+        which weighs, sums and picks the category for the whole batch in one call.
+        """
+        if not results:
+            return []
+        # The pipeline returns labels sorted by confidence — record each score's canonical label index
+        positions = np.array([[_LABEL_TO_ID[label] for label in r["labels"]] for r in results], dtype=np.int64)
+        scores = np.array([r["scores"] for r in results], dtype=np.float64)
+
+        totals, category_ids = _reduce(scores, positions, _WEIGHTS)
+
+        importance_scores = totals.tolist()
+        categories = [_LABELS[i] for i in category_ids.tolist()]
+
+        return list(zip(importance_scores, categories))
 
     def _compute_importance(self, title: str, body: str | None = None) -> tuple[float, str]:
         """
@@ -78,42 +420,144 @@ class ClassifierService:
             importance_score: weighted sum of (confidence × label_weight), range [0.2, 1.0]
             category: the label with the highest weighted score
         """
-        body_snippet = (body or "")[:300].strip()
-        text = f"{title}. {body_snippet}" if body_snippet else title
+        return self._compute_importance_batch([self._build_text(title, body)])[0]
 
-        pipe = self._get_pipeline()
-        result = pipe(text, candidate_labels=list(LABEL_WEIGHTS.keys()))
+    def _compute_importance_batch(self, texts: list[str]) -> list[tuple[float, str]]:
+        """
+        Batched version of _compute_importance: classifies all texts in a single pipeline call
+        so the model runs full batches instead of one forward pass per article.
+        Texts already in the cache are answered from it and never reach the model, and a text
+        repeated within the batch (e.g. the same story in two feeds) is classified only once.
+        With keyword_prefilter on, texts without any high-signal keyword skip the model too.
 
-        # Map each label to its weighted score (confidence × weight)
-        weighted_scores = {
-            label: score * LABEL_WEIGHTS[label]
-            for label, score in zip(result["labels"], result["scores"])
-        }
+        Returns:
+            one (importance_score, category) tuple per input text, in input order
+        """
+        keys = [self._cache_key(text) for text in texts]
+        results = [
+            _PREFILTERED_RESULT if self.keyword_prefilter and not _HIGH_SIGNAL_RE.search(text)
+            else self._cache_get(key)
+            for key, text in zip(keys, texts)
+        ]
+
+        # Unique uncached texts, in first-seen order
+        pending: dict[str, str] = {}
+        for key, text, result in zip(keys, texts, results):
+            if result is None:
+                pending.setdefault(key, text)
+
+        if pending:
+            pipe = self._get_pipeline()
+            # batch_size counts premise/hypothesis pairs: every pair of a small batch goes into one
+            # forward pass, larger ones are split into CLASSIFY_BATCH_SIZE chunks
+            outputs = pipe(
+                list(pending.values()),
+                candidate_labels=_LABELS,
+                batch_size=min(CLASSIFY_BATCH_SIZE, len(pending) * len(_LABELS)),
+            )
+            fresh = dict(zip(pending, self._weigh_batch(outputs)))
+            for key, result in fresh.items():
+                self._cache_put(key, result)
+            results = [fresh[key] if result is None else result for key, result in zip(keys, results)]
 
-        importance_score = sum(weighted_scores.values())
-        category = max(weighted_scores, key=weighted_scores.get)
+        return results
 
-        return importance_score, category
+    def _compute_importance_each(self, texts: list[str]) -> list[tuple[float | None, str | None]]:
+        """
+        Fallback after a failed batch: classify the texts one at a time, so an input that breaks the
+        model only costs its own scores. If the model itself cannot be loaded, nothing is retried.
 
-    def _compute_recency(self, published_at: datetime) -> float:
+        Returns:
+            one (importance_score, category) tuple per text, (None, None) where classification failed
         """
-        Compute a recency score using exponential decay.
+        try:
+            self._get_pipeline()
+        except Exception as e:
+            logger.error(f"Model unavailable, saving {len(texts)} articles unclassified: {e}")
+            return [(None, None)] * len(texts)
+
+        results = []
+        for text in texts:
+            try:
+                results.append(self._compute_importance_batch([text])[0])
+            except Exception as e:
+                logger.error(f"Classification failed for '{text[:60]}': {e}")
+                results.append((None, None))
+        return results
+
+    def _compute_recency(self, published_at: datetime, now: datetime | None = None) -> float:
+        """
+        Compute a recency score using exponential decay, read from the quarter-hour lookup table.
         Score is 1.0 at publication time, 0.5 after 48h, approaches 0 over time.
 
         Args:
-            published_at: UTC datetime of publication
+            published_at: datetime of publication, aware in any zone or naive UTC (see _as_utc)
+            now: aware UTC reference time; defaults to the current time. Callers scoring many
+                articles can sample it once and pass it in, instead of one clock read per article.
 
         Returns:
             recency_score in range (0, 1]
         """
-        # Ensure the datetime is timezone-aware before subtracting
-        if published_at.tzinfo is None:
-            published_at = published_at.replace(tzinfo=timezone.utc)
+        now = now or datetime.now(timezone.utc)
+        hours_elapsed = (now - _as_utc(published_at)).total_seconds() / 3600
+        step = round(hours_elapsed * RECENCY_LUT_STEPS_PER_HOUR)
+        step = min(max(step, 0), len(_RECENCY_LUT) - 1)  # guard against future-dated (and very old) articles
+
+        return float(_RECENCY_LUT[step])
+
+    def recency_scores(self, published_ats: list[datetime], now: datetime | None = None) -> np.ndarray:
+        """
+        Vectorised _compute_recency for a whole list of articles, used by the read routes to rank them.
+        `now` is sampled once, so every article is scored against the same instant.
+
+        Args:
+            published_ats: datetimes of publication, aware in any zone or naive UTC (see _as_utc)
+            now: aware UTC reference time, as for _compute_recency
 
-        hours_elapsed = (datetime.now(timezone.utc) - published_at).total_seconds() / 3600
-        hours_elapsed = max(0.0, hours_elapsed)  # guard against future-dated articles
+        Returns:
+            array of recency scores in range (0, 1], aligned with published_ats
+        """
+        now = now or datetime.now(timezone.utc)
+        seconds_elapsed = np.array([(now - _as_utc(p)).total_seconds() for p in published_ats], dtype=np.float64)
+        steps = np.rint(seconds_elapsed * (RECENCY_LUT_STEPS_PER_HOUR / 3600.0)).astype(np.int64)
+        steps = np.clip(steps, 0, len(_RECENCY_LUT) - 1)  # guard against future-dated (and very old) articles
+
+        return _RECENCY_LUT[steps]
+
+    def _build_article(
+        self,
+        article: ArticleIngest,
+        importance_score: float | None,
+        category: str | None,
+        is_update: bool,
+    ) -> Article:
+        """
+        Build the Article row for a classified article. The caller is responsible for saving it.
+        A None importance_score means classification failed: the article is kept with is_filtered = False.
+        """
+        is_filtered = importance_score is not None and importance_score > IMPORTANCE_THRESHOLD
 
-        return math.exp(-RECENCY_LAMBDA * hours_elapsed)
+        if importance_score is not None:
+            status = "PASS" if is_filtered else "FAIL"
+            action = "UPDATE" if is_update else "NEW"
+            logger.info(
+                f"[{article.source}] [{action}] [{status}] '{article.title[:60]}' "
+                f"(importance={importance_score:.3f}, category='{category}')"
+            )
+
+        db_article = Article(
+            id=article.id,
+            source=article.source,
+            title=article.title,
+            body=article.body,
+            published_at=article.published_at,
+            url=article.url,
+            importance_score=importance_score,
+            is_filtered=is_filtered,
+            category=category,
+        )
+
+        return db_article
 
     def classify_and_save(self, article: ArticleIngest, db: Session) -> Article:
         """
@@ -141,39 +585,65 @@ class ClassifierService:
 
         importance_score = None
         category = None
-        is_filtered = False
 
         try:
             importance_score, category = self._compute_importance(article.title, article.body)
-            is_filtered = importance_score > IMPORTANCE_THRESHOLD
-
-            status = "PASS" if is_filtered else "FAIL"
-            action = "UPDATE" if existing else "NEW"
-            logger.info(
-                f"[{article.source}] [{action}] [{status}] '{article.title[:60]}' "
-                f"(importance={importance_score:.3f}, category='{category}')"
-            )
-
         except Exception as e:
             logger.error(f"Classification failed for article '{article.id}': {e}")
 
-        db_article = Article(
-            id=article.id,
-            source=article.source,
-            title=article.title,
-            body=article.body,
-            published_at=article.published_at,
-            url=article.url,
-            importance_score=importance_score,
-            is_filtered=is_filtered,
-            category=category,
-        )
-
+        db_article = self._build_article(article, importance_score, category, existing is not None)
         db.merge(db_article)
         db.commit()
 
         return db_article
 
+    def classify_and_save_many(self, articles: list[ArticleIngest], db: Session) -> list[Article]:
+        """
+        Batched version of classify_and_save: same skip-if-unchanged and failure semantics,
+        but every new or changed article is classified in a single batched model call and
+        written with a single bulk upsert + commit. If the batch call fails, the articles are
+        classified one by one, so only the ones that actually fail are saved with null scores.
+
+        Args:
+            articles: the incoming articles to classify
+            db: active SQLAlchemy session
+
+        Returns:
+            the saved Article ORM objects, in input order
+        """
+        saved: list[Article | None] = [None] * len(articles)
+        pending = []  # (position, article, is_update) for articles that need classification
+
+        # One SELECT ... WHERE id IN (...) for the whole batch instead of a lookup per article
+        ids = {article.id for article in articles}
+        existing_by_id = {a.id: a for a in db.scalars(select(Article).where(Article.id.in_(ids)))} if ids else {}
+
+        for i, article in enumerate(articles):
+            existing = existing_by_id.get(article.id)
+            if existing and existing.title == article.title and existing.body == article.body:
+                logger.debug(f"[{article.source}] SKIP '{article.title[:60]}' — unchanged")
+                saved[i] = existing
+            else:
+                pending.append((i, article, existing is not None))
+
+        if not pending:
+            return saved
+
+        texts = [self._build_text(article.title, article.body) for _, article, _ in pending]
+        try:
+            results = self._compute_importance_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch classification failed for {len(pending)} articles, retrying one by one: {e}")
+            results = self._compute_importance_each(texts)
+
+        for (i, article, is_update), (importance_score, category) in zip(pending, results):
+            saved[i] = self._build_article(article, importance_score, category, is_update)
+
+        _upsert_articles([saved[i] for i, _, _ in pending], db)
+        db.commit()
+
+        return saved
+
 
 # Shared singleton — imported by the fetcher and the /ingest route
 classifier = ClassifierService()
\ No newline at end of file
@@ -1,27 +1,74 @@
 import asyncio
+import html
 import logging
 import re
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import List
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 
 import feedparser
+import httpx
 from sqlalchemy.orm import Session
 
 from app.schemas import ArticleIngest
 
+try:
+    from selectolax.lexbor import LexborHTMLParser  # C-backed HTML parser, also decodes entities
+except ImportError:  # optional — strip_html falls back to the regex below
+    LexborHTMLParser = None
+
 logger = logging.getLogger(__name__)
 
 FETCH_INTERVAL_SECONDS = 300  # 5 minutes
+FEED_TIMEOUT_SECONDS = 10     # per-feed HTTP timeout
+# feedparser sanitizes HTML and resolves relative URIs in every entry by default. Bodies go
+# through strip_html() and only plain text is kept, so that pass is pure overhead (~half the parse time).
+FEEDPARSER_OPTIONS = {"sanitize_html": False, "resolve_relative_uris": False}
+
+# Shared by the sync and async clients. HTTP/2 lets requests to the same host share one connection.
+HTTP_CLIENT_OPTIONS = {
+    "http2": True,
+    "timeout": FEED_TIMEOUT_SECONDS,
+    "follow_redirects": True,
+    "headers": {"User-Agent": feedparser.USER_AGENT},  # same UA feedparser sends when it fetches itself
+}
+# Pooled client for the blocking fetch() path, so repeat polls reuse connections instead of a new
+# TCP + TLS handshake per feed. httpx.Client is thread-safe, so concurrent callers can share it.
+_CLIENT = httpx.Client(**HTTP_CLIENT_OPTIONS)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+# Feeds redeliver the same entries every cycle, so stripped bodies and parsed dates are
+# memoised on their raw input. Sized to cover every entry of every source several times over.
+PARSE_CACHE_SIZE = 8192
+
+
 def strip_html(text: str) -> str:
-    """Remove HTML tags from a string, returning clean plain text."""
-    return re.sub(r"<[^>]+>", "", text or "").strip()
+    """
+    Remove HTML tags from a string, returning clean plain text.
+    Entities are decoded and runs of whitespace (newlines from block markup, indentation)
+    collapsed to single spaces, so the classifier's 300-char snippet is all content.
+    """
+    if not text:
+        return ""
+    return _strip_html(text)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _strip_html(text: str) -> str:
+    if LexborHTMLParser is not None:
+        plain = LexborHTMLParser(text).text(separator="")
+    else:
+        plain = html.unescape(_HTML_TAG_RE.sub("", text))
+    return _WHITESPACE_RE.sub(" ", plain).strip()
 
 
 def parse_date(entry) -> datetime:
@@ -31,10 +78,16 @@ def parse_date(entry) -> datetime:
     """
     parsed = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
     if parsed:
-        return datetime(*parsed[:6], tzinfo=timezone.utc)
+        return _parse_struct_time(tuple(parsed[:6]))
     return datetime.now(timezone.utc)
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_struct_time(parsed: tuple) -> datetime:
+    """(year, month, day, hour, minute, second) from a time.struct_time → UTC datetime."""
+    return datetime(*parsed, tzinfo=timezone.utc)
+
+
 # ---------------------------------------------------------------------------
 # Base source — subclass this to add a new source
 # ---------------------------------------------------------------------------
@@ -51,54 +104,143 @@ class BaseSource(ABC):
         """Fetch articles and return them as a list of ArticleIngest objects."""
         pass
 
+    async def fetch_async(self, client: httpx.AsyncClient) -> List[ArticleIngest]:
+        """
+        Async variant of fetch(), used to fetch all sources concurrently.
+        Defaults to running fetch() in a worker thread; HTTP-based sources override it to use client.
+        """
+        return await asyncio.to_thread(self.fetch)
+
 
 # ---------------------------------------------------------------------------
 # RSS source — shared fetch logic for all RSS-based sources
 # ---------------------------------------------------------------------------
 
+# Where an entry's body can live: RSS <description> / Atom <summary>, or <content:encoded> / Atom <content>
+_BODY_GETTERS = {
+    "summary": lambda entry: entry.get("summary"),
+    "content": lambda entry: (entry.get("content") or [{}])[0].get("value"),
+}
+
+
+def compile_body_extractor(fields: tuple) -> Callable[[object], str]:
+    """
+    Build an entry → raw body function that tries the given fields in order.
+    The field lookups are resolved once here, not for every entry of every poll.
+    """
+    getters = tuple(_BODY_GETTERS[field] for field in fields)
+
+    def extract(entry) -> str:
+        for get in getters:
+            body = get(entry)
+            if body:
+                return body
+        return ""
+
+    return extract
+
+
 class RSSSource(BaseSource):
     """
     Reusable RSS fetcher. Subclasses only need to set source_name and feed_url.
     Handles parsing, HTML stripping, date extraction, and error logging.
+    Remembers the feed's ETag / Last-Modified validators, so a later fetch by the same
+    instance is a conditional GET and an unchanged feed (304) yields no articles. A download's
+    validators are only held as pending until commit_validators() is called once its articles
+    are stored; until then the next fetch re-downloads the feed in full.
+    A subclass whose feed keeps the full text elsewhere can reorder body_fields, e.g.
+    ("content", "summary"); its extractor is compiled once, when the class is defined.
     """
     feed_url: str
+    body_fields: tuple = ("summary", "content")
+    _extract_body = staticmethod(compile_body_extractor(body_fields))
+    _etag: Optional[str] = None
+    _last_modified: Optional[str] = None
+    _pending_validators: Optional[tuple] = None  # (ETag, Last-Modified) of the last 200, not yet committed
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._extract_body = staticmethod(compile_body_extractor(cls.body_fields))
 
     def fetch(self) -> List[ArticleIngest]:
+        """Download the feed with the module's pooled client, then parse the response body."""
+        self._pending_validators = None
         try:
-            feed = feedparser.parse(self.feed_url)  # fetches and parses the RSS feed into a structured object
-            articles = []
-
-            for entry in feed.entries:
-                # Use the RSS GUID as the article ID; fall back to the link
-                article_id = entry.get("id") or entry.get("link")
-                if not article_id:
-                    logger.warning(f"[{self.source_name}] Skipping entry with no ID or link")
-                    continue
-
-                # RSS body may be in 'summary' or nested inside 'content'
-                raw_body = (
-                    entry.get("summary")
-                    or (entry.get("content") or [{}])[0].get("value")
-                    or ""
-                )
-
-                articles.append(ArticleIngest(
-                    id=article_id,
-                    source=self.source_name,
-                    title=entry.get("title", "").strip(),
-                    body=strip_html(raw_body) or None,
-                    published_at=parse_date(entry),
-                    url=entry.get("link") or None,
-                ))
-
-            logger.info(f"[{self.source_name}] Fetched {len(articles)} articles")
-            return articles
+            response = _CLIENT.get(self.feed_url, headers=self._conditional_headers())
+            return self._parse_response(response)
 
         except Exception as e:
             # Log the error and return an empty list so other sources are unaffected
             logger.error(f"[{self.source_name}] Failed to fetch: {e}")
             return []
 
+    async def fetch_async(self, client: httpx.AsyncClient) -> List[ArticleIngest]:
+        """
+        Download the feed with the shared async client, then parse it exactly like fetch().
+        Parsing (XML, HTML stripping, validation) is CPU work, so it runs in a worker thread
+        instead of blocking the event loop the API serves requests on.
+        """
+        self._pending_validators = None
+        try:
+            response = await client.get(self.feed_url, headers=self._conditional_headers())
+            return await asyncio.to_thread(self._parse_response, response)
+
+        except Exception as e:
+            # Log the error and return an empty list so other sources are unaffected
+            logger.error(f"[{self.source_name}] Failed to fetch: {e}")
+            return []
+
+    def _conditional_headers(self) -> Dict[str, str]:
+        """Validators from the last successful download, so an unchanged feed answers 304."""
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def commit_validators(self) -> None:
+        """Adopt the last download's validators. Call once its articles are stored, never before."""
+        if self._pending_validators is not None:
+            self._etag, self._last_modified = self._pending_validators
+            self._pending_validators = None
+
+    def _parse_response(self, response: httpx.Response) -> List[ArticleIngest]:
+        """Parse a downloaded feed, holding its validators as pending. A 304 yields no articles."""
+        if response.status_code == 304:
+            logger.info(f"[{self.source_name}] Not modified")
+            return []
+        response.raise_for_status()
+        self._pending_validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        # feedparser only parses here — it never does its own (unpooled, urllib-based) HTTP
+        feed = feedparser.parse(response.content, **FEEDPARSER_OPTIONS)
+        return self._parse_feed(feed)
+
+    def _parse_feed(self, feed) -> List[ArticleIngest]:
+        """Convert the entries of a parsed feed into ArticleIngest objects."""
+        articles = []
+
+        for entry in feed.entries:
+            # Use the RSS GUID as the article ID; fall back to the link
+            article_id = entry.get("id") or entry.get("link")
+            if not article_id:
+                logger.warning(f"[{self.source_name}] Skipping entry with no ID or link")
+                continue
+
+            raw_body = self._extract_body(entry)
+
+            articles.append(ArticleIngest(
+                id=article_id,
+                source=self.source_name,
+                title=entry.get("title", "").strip(),
+                body=strip_html(raw_body) or None,
+                published_at=parse_date(entry),
+                url=entry.get("link") or None,
+            ))
+
+        logger.info(f"[{self.source_name}] Fetched {len(articles)} articles")
+        return articles
+
 
 # ---------------------------------------------------------------------------
 # Default sources — seeded into the DB on first startup
@@ -136,8 +278,12 @@ class FetcherService:
     classifies each article, and persists the result to the database.
     """
 
-    def __init__(self, interval_seconds: int = FETCH_INTERVAL_SECONDS):
+    def __init__(self, interval_seconds: int = FETCH_INTERVAL_SECONDS, on_saved: Optional[Callable[[], None]] = None):
+        """on_saved: called after each cycle that stored articles (e.g. to drop cached API responses)."""
         self.interval_seconds = interval_seconds
+        self.on_saved = on_saved
+        # feed_url → source, kept across cycles so each source keeps its conditional-GET validators
+        self._sources: Dict[str, RSSSource] = {}
 
     async def run(self, db_factory, classifier):
         """
@@ -147,41 +293,65 @@ class FetcherService:
         """
         logger.info("FetcherService started — fetching every %ds", self.interval_seconds)
         await asyncio.sleep(5)  # let the server finish starting before first fetch
-        loop = asyncio.get_event_loop()
         while True:
-            await loop.run_in_executor(None, self._fetch_all, db_factory, classifier)
+            await self._fetch_all_async(db_factory, classifier)
             await asyncio.sleep(self.interval_seconds)
 
     def _fetch_all(self, db_factory, classifier):
-        """Fetch from every registered source and persist classified results."""
+        """Synchronous fetch cycle, for callers outside the event loop (e.g. the /fetch route)."""
+        asyncio.run(self._fetch_all_async(db_factory, classifier))
+
+    async def _fetch_all_async(self, db_factory, classifier):
+        """
+        Fetch from every registered source concurrently and persist classified results.
+        Downloads run on the event loop; the DB reads and the model forward pass are
+        blocking, so they are pushed to worker threads to keep the API responsive.
+        """
         logger.info("Starting fetch cycle")
 
-        # Load all sources from DB (default + user-added)
+        sources = await asyncio.to_thread(self._load_sources, db_factory)
+        articles = await self._fetch_sources(sources)  # errors are handled inside fetch_async()
+
+        if articles:
+            await asyncio.to_thread(self._classify_and_save, articles, db_factory, classifier)
+            if self.on_saved is not None:
+                self.on_saved()
+        # Only now may the next poll skip these articles with a conditional GET — if saving
+        # raised above, the validators stay pending and the feed is downloaded in full again
+        for source in sources:
+            source.commit_validators()
+
+        logger.info("Fetch cycle complete")
+
+    @staticmethod
+    def _classify_and_save(articles: List[ArticleIngest], db_factory, classifier):
+        db: Session = db_factory()
+        try:
+            # Classify every source's articles in one batch — overwrites existing articles if IDs already exist
+            classifier.classify_and_save_many(articles, db)
+        finally:
+            db.close()
+
+    def _load_sources(self, db_factory) -> List[RSSSource]:
+        """Load all sources from DB (default + user-added)."""
         from app.models import RSSSourceModel
         db: Session = db_factory()
         try:
             rows = db.query(RSSSourceModel).all()
             sources = []
             for row in rows:
-                s = RSSSource()
+                s = self._sources.get(row.feed_url)
+                if s is None:
+                    s = self._sources[row.feed_url] = RSSSource()
+                    s.feed_url = row.feed_url
                 s.source_name = row.name
-                s.feed_url = row.feed_url
                 sources.append(s)
+            return sources
         finally:
             db.close()
 
-        for source in sources:
-            articles = source.fetch()  # errors are handled inside fetch()
-
-            if not articles:
-                continue
-
-            db: Session = db_factory()
-            try:
-                for article in articles:
-                    # Classify and save — overwrites existing article if ID already exists
-                    classifier.classify_and_save(article, db)
-            finally:
-                db.close()
-
-        logger.info("Fetch cycle complete")
\ No newline at end of file
+    async def _fetch_sources(self, sources: List[BaseSource]) -> List[ArticleIngest]:
+        """Download all sources concurrently, so a cycle takes as long as the slowest feed, not the sum."""
+        async with httpx.AsyncClient(**HTTP_CLIENT_OPTIONS) as client:
+            results = await asyncio.gather(*(source.fetch_async(client) for source in sources))
+        return [article for articles in results for article in articles]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Boolean, DateTime, Text, Integer
+from sqlalchemy import Column, String, Float, Boolean, DateTime, Text, Integer, Index
 from datetime import datetime, timezone
 from app.database import Base
 
@@ -24,6 +24,17 @@ class Article(Base):
     # --- Metadata ---
     ingested_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))  # when we received it
 
+    # Partial index over the rows /retrieve and /articles serve (WHERE is_filtered), newest first.
+    # final_score is computed at retrieve time, so published_at is the stored column that orders them.
+    __table_args__ = (
+        Index(
+            "ix_articles_filtered_published_at",
+            published_at.desc(),
+            postgresql_where=is_filtered == True,  # same predicate as the route queries
+            sqlite_where=is_filtered == True,
+        ),
+    )
+
 
 class RSSSourceModel(Base):
     __tablename__ = "sources"
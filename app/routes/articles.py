@@ -1,13 +1,15 @@
 import logging
-import math
-from datetime import datetime, timezone
-from typing import List
+import threading
+from typing import Callable, List, Literal, Optional
 
 import feedparser
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.classifier import classifier, RECENCY_LAMBDA
+from app.classifier import classifier
 from app.database import SessionLocal, get_db
 from app.fetcher import FetcherService
 from app.models import Article, RSSSourceModel
@@ -17,29 +19,108 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# ---------------------------------------------------------------------------
+# Response cache — serialised /retrieve and /articles bodies, shared across requests.
+# Data only changes on a fetch cycle or an /ingest call, so bursts of UI reruns
+# are served from memory. Cleared whenever this process writes new articles (including
+# the background fetch cycle); writes from another process show up once the TTL expires.
+# ---------------------------------------------------------------------------
 
-def _compute_recency(published_at: datetime) -> float:
-    """Exponential decay recency score — 1.0 at publication, 0.5 after 48h."""
-    if published_at.tzinfo is None:
-        published_at = published_at.replace(tzinfo=timezone.utc)
-    hours_elapsed = max(0.0, (datetime.now(timezone.utc) - published_at).total_seconds() / 3600)
-    return math.exp(-RECENCY_LAMBDA * hours_elapsed)
+RESPONSE_CACHE_TTL_SECONDS = 30
 
+_response_cache: TTLCache = TTLCache(maxsize=64, ttl=RESPONSE_CACHE_TTL_SECONDS)
+_response_cache_lock = threading.Lock()  # sync handlers run concurrently in FastAPI's threadpool
+_response_cache_generation = 0  # bumped on every invalidation, guarded by _response_cache_lock
 
-def _with_scores(articles: List[Article]) -> List[dict]:
+
+def _cached_json(key: str, build: Callable[[], bytes]) -> Response:
+    """
+    Return the cached JSON body for key, building and caching it on a miss.
+    The body is built outside the lock; if the cache was invalidated meanwhile, it may hold
+    pre-write data, so it is returned but not stored.
+    """
+    with _response_cache_lock:
+        body = _response_cache.get(key)
+        generation = _response_cache_generation
+    if body is None:
+        body = build()
+        with _response_cache_lock:
+            if generation == _response_cache_generation:
+                _response_cache[key] = body
+    return Response(content=body, media_type="application/json")
+
+
+def invalidate_response_cache() -> None:
+    """Drop every cached response. Called after each write path: /ingest, /fetch and the background fetch cycle."""
+    global _response_cache_generation
+    with _response_cache_lock:
+        _response_cache.clear()
+        _response_cache_generation += 1
+
+
+def _with_scores(articles: List[Article], sort_by_final: bool = True) -> List[dict]:
     """
-    Enrich a list of Article ORM objects with freshly computed recency_score
-    and final_score, then sort by final_score descending.
+    Enrich a list of Article rows (ORM objects or Core rows) with freshly computed recency_score
+    and final_score, then sort by final_score descending (unless sort_by_final is False,
+    in which case the input order is kept).
     """
+    recencies = classifier.recency_scores([a.published_at for a in articles])
     enriched = []
-    for a in articles:
-        recency = _compute_recency(a.published_at)
+    for a, recency in zip(articles, recencies.tolist()):
         final = (a.importance_score or 0.0) * recency
         enriched.append((final, recency, a))
-    enriched.sort(key=lambda x: x[0], reverse=True)
+    if sort_by_final:
+        enriched.sort(key=lambda x: x[0], reverse=True)
     return enriched
 
 
+# ---------------------------------------------------------------------------
+# Sorting — "score" is final_score, the others are stored columns
+# ---------------------------------------------------------------------------
+
+ArticleSort = Literal["score", "importance", "recent"]
+
+# Columns read by each endpoint. The read paths select just these with Core instead of loading
+# Article ORM instances — no identity map or attribute tracking for rows that are only serialised.
+_RETRIEVE_COLUMNS = (
+    Article.id, Article.source, Article.title, Article.body, Article.published_at,
+    Article.importance_score,  # needed to compute final_score, not returned
+)
+_ARTICLES_COLUMNS = _RETRIEVE_COLUMNS + (Article.category, Article.ingested_at, Article.url)
+
+_SQL_ORDER = {
+    "importance": Article.importance_score.desc(),
+    "recent": Article.published_at.desc(),  # served by ix_articles_filtered_published_at
+}
+
+
+def _ranked_articles(
+    db: Session,
+    columns: tuple,
+    sort: ArticleSort,
+    limit: Optional[int],
+    categories: Optional[List[str]] = None,
+    sources: Optional[List[str]] = None,
+) -> List[tuple]:
+    """
+    Return (final, recency, row) tuples for the filtered articles, ordered by sort
+    and capped at limit. Each row is a Core Row holding only columns, read by attribute.
+    categories / sources, when given, restrict the rows in SQL to those values.
+    Stored-column sorts are pushed into SQL with ORDER BY ... LIMIT, so only the returned
+    rows are loaded and scored. final_score depends on the current time, so for
+    sort="score" every filtered row is scored and the result sliced.
+    """
+    stmt = select(*columns).where(Article.is_filtered == True)
+    if categories:
+        stmt = stmt.where(Article.category.in_(categories))
+    if sources:
+        stmt = stmt.where(Article.source.in_(sources))
+    if sort == "score":
+        return _with_scores(db.execute(stmt).all())[:limit]
+    rows = db.execute(stmt.order_by(_SQL_ORDER[sort]).limit(limit)).all()
+    return _with_scores(rows, sort_by_final=False)
+
+
 @router.get("/health")
 def health():
     """Returns the model loading status. 'loading' until the ML model is ready, then 'ready'."""
@@ -53,56 +134,99 @@ def ingest(articles: List[ArticleIngest], db: Session = Depends(get_db)):
     Returns an acknowledgment with the count of articles received.
     """
     logger.info(f"[/ingest] Received batch of {len(articles)} articles")
-    for article in articles:
-        classifier.classify_and_save(article, db)
+    classifier.classify_and_save_many(articles, db)
+    invalidate_response_cache()
     logger.info(f"[/ingest] Batch processed successfully")
     return {"status": "ok", "received": len(articles)}
 
 
 @router.get("/retrieve", response_model=List[ArticleResponse])
-def retrieve(db: Session = Depends(get_db)):
+def retrieve(
+    limit: Optional[int] = Query(None, ge=1),
+    sort: ArticleSort = "score",
+    db: Session = Depends(get_db),
+):
     """
     Return all filtered articles sorted by final_score descending.
-    final_score = importance_score × recency_score, computed fresh at request time.
+    Optional ?sort=importance|recent and ?limit=N change the order and cap the result.
+    final_score = importance_score × recency_score, computed at request time
+    (served from the response cache for up to RESPONSE_CACHE_TTL_SECONDS).
     Response matches the API contract shape exactly (id, source, title, body, published_at).
     """
-    articles = db.query(Article).filter(Article.is_filtered == True).all()
-    sorted_articles = [a for _, _, a in _with_scores(articles)]
-    logger.info(f"[/retrieve] Returning {len(sorted_articles)} filtered articles")
-    return sorted_articles
+    def build() -> bytes:
+        # Rows are built as plain dicts and dumped with orjson — these are read-only egress
+        # responses, so the Pydantic validation round trip buys nothing. Keys follow ArticleResponse.
+        result = [
+            {
+                "id": a.id,
+                "source": a.source,
+                "title": a.title,
+                "body": a.body,
+                "published_at": a.published_at,
+            }
+            for _, _, a in _ranked_articles(db, _RETRIEVE_COLUMNS, sort, limit)
+        ]
+        logger.info(f"[/retrieve] Returning {len(result)} filtered articles")
+        return orjson.dumps(result)
+
+    return _cached_json(f"retrieve:{sort}:{limit}", build)
 
 
 @router.post("/fetch")
 def trigger_fetch():
     """Trigger an immediate fetch and classification of all RSS sources. Blocks until complete."""
-    FetcherService()._fetch_all(SessionLocal, classifier)
+    FetcherService(on_saved=invalidate_response_cache)._fetch_all(SessionLocal, classifier)
     return {"status": "ok"}
 
 
 @router.get("/articles", response_model=List[ArticleFullResponse])
-def articles_full(db: Session = Depends(get_db)):
+def articles_full(
+    limit: Optional[int] = Query(None, ge=1),
+    sort: ArticleSort = "score",
+    categories: Optional[List[str]] = Query(None),
+    sources: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db),
+):
     """
     Return all filtered articles with full classification fields for the UI.
-    recency_score and final_score are computed fresh at request time and injected into the response.
+    Accepts the same ?sort and ?limit parameters as /retrieve, plus repeatable
+    ?categories=...&sources=... to keep only articles in those categories / from those sources.
+    recency_score and final_score are computed at request time and injected into the response
+    (served from the response cache for up to RESPONSE_CACHE_TTL_SECONDS).
     """
-    articles = db.query(Article).filter(Article.is_filtered == True).all()
-    result = []
-    for final, recency, a in _with_scores(articles):
-        result.append(ArticleFullResponse(
-            id=a.id,
-            source=a.source,
-            title=a.title,
-            body=a.body,
-            published_at=a.published_at,
-            url=a.url,
-            importance_score=a.importance_score,
-            recency_score=recency,
-            final_score=final,
-            category=a.category,
-            ingested_at=a.ingested_at,
-        ))
-    logger.info(f"[/articles] Returning {len(result)} articles with full detail")
-    return result
+    def build() -> bytes:
+        # Plain dicts in ArticleFullResponse field order, dumped with orjson (see /retrieve)
+        result = [
+            {
+                "id": a.id,
+                "source": a.source,
+                "title": a.title,
+                "body": a.body,
+                "published_at": a.published_at,
+                "importance_score": a.importance_score,
+                "recency_score": recency,
+                "final_score": final,
+                "category": a.category,
+                "ingested_at": a.ingested_at,
+                "url": a.url,
+            }
+            for final, recency, a in _ranked_articles(db, _ARTICLES_COLUMNS, sort, limit, categories, sources)
+        ]
+        logger.info(f"[/articles] Returning {len(result)} articles with full detail")
+        return orjson.dumps(result)
+
+    key = f"articles:{sort}:{limit}:{sorted(categories or [])}:{sorted(sources or [])}"
+    return _cached_json(key, build)
+
+
+@router.get("/articles/sources", response_model=List[str])
+def article_sources(db: Session = Depends(get_db)):
+    """Return the distinct sources of the filtered articles, alphabetically. Used to populate the UI's source filter."""
+    def build() -> bytes:
+        stmt = select(Article.source).where(Article.is_filtered == True).distinct().order_by(Article.source)
+        return orjson.dumps(db.execute(stmt).scalars().all())
+
+    return _cached_json("articles:sources", build)
 
 
 @router.post("/sources", status_code=201)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, field_validator
+from datetime import datetime, timezone
 from typing import Optional
 
 
@@ -12,6 +12,12 @@ class ArticleIngest(BaseModel):
     published_at: datetime
     url: Optional[str] = None
 
+    @field_validator("published_at")
+    @classmethod
+    def published_at_to_utc(cls, value: datetime) -> datetime:
+        """Normalise to aware UTC once at the boundary — naive values are taken to be UTC already."""
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
 
 class ArticleResponse(BaseModel):
     """Shape returned by the /retrieve endpoint — matches the API contract exactly."""
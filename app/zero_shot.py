@@ -0,0 +1,72 @@
+"""
+Zero-shot classification pipeline that tokenizes each text and each hypothesis only once.
+Imported lazily by app.classifier, since it pulls in torch and transformers.
+"""
+import torch
+from transformers import ZeroShotClassificationPipeline
+
+
+class CachedHypothesisZeroShotPipeline(ZeroShotClassificationPipeline):
+    """
+    The stock pipeline tokenizes every (text, hypothesis) pair from scratch, so each text is
+    tokenized once per candidate label and the same hypotheses are tokenized again for every text.
+    Here the text is encoded once, the hypothesis encodings are kept across calls, and each pair
+    is assembled by the tokenizer's post-processor (special tokens, attention mask, type ids).
+    Truncation matches the stock ONLY_FIRST strategy: only the text is cut to fit model_max_length.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hypothesis_encodings = {}  # formatted hypothesis → tokenizers.Encoding
+
+    def preprocess(self, inputs, candidate_labels=None, hypothesis_template="This example is {}."):
+        if not self.tokenizer.is_fast:  # slow tokenizers have no backend encodings to reuse
+            yield from super().preprocess(inputs, candidate_labels, hypothesis_template)
+            return
+
+        # Validates the labels and template exactly as the stock pipeline does
+        _, sequences = self._args_parser(inputs, candidate_labels, hypothesis_template)
+
+        backend = self.tokenizer.backend_tokenizer
+        # The wrapper re-applies its own truncation/padding settings on every __call__
+        backend.no_truncation()
+        backend.no_padding()
+
+        premise = backend.encode(sequences[0], add_special_tokens=False)
+        budget = self.tokenizer.model_max_length - self.tokenizer.num_special_tokens_to_add(pair=True)
+        hypotheses = [self._hypothesis_encoding(hypothesis_template.format(label)) for label in candidate_labels]
+
+        # Encoding.truncate works in place and can only shrink, so build pairs from the longest
+        # allowed premise down. A hypothesis with no room left keeps the premise whole, as the
+        # stock pipeline does when ONLY_FIRST truncation fails.
+        rooms = [budget - len(hypothesis) for hypothesis in hypotheses]
+        pairs = [None] * len(candidate_labels)
+        for i in sorted(range(len(rooms)), key=lambda i: (rooms[i] > 0, -rooms[i])):
+            if len(premise) > rooms[i] > 0:
+                premise.truncate(rooms[i])
+            pairs[i] = backend.post_process(premise, hypotheses[i], add_special_tokens=True)
+
+        for i, (candidate_label, pair) in enumerate(zip(candidate_labels, pairs)):
+            yield {
+                "candidate_label": candidate_label,
+                "sequence": sequences[0],
+                "is_last": i == len(candidate_labels) - 1,
+                **self._to_model_input(pair),
+            }
+
+    def _hypothesis_encoding(self, hypothesis: str):
+        encoding = self._hypothesis_encodings.get(hypothesis)
+        if encoding is None:
+            encoding = self.tokenizer.backend_tokenizer.encode(hypothesis, add_special_tokens=False)
+            self._hypothesis_encodings[hypothesis] = encoding
+        return encoding
+
+    def _to_model_input(self, encoding) -> dict:
+        """Shape one encoded pair like the tokenizer's return_tensors="pt" output for a batch of one."""
+        model_input = {
+            "input_ids": torch.tensor([encoding.ids]),
+            "attention_mask": torch.tensor([encoding.attention_mask]),
+        }
+        if "token_type_ids" in self.tokenizer.model_input_names:
+            model_input["token_type_ids"] = torch.tensor([encoding.type_ids])
+        return model_input
@@ -7,7 +7,8 @@ from fastapi import FastAPI
 from app.classifier import classifier
 from app.database import Base, SessionLocal, engine
 from app.fetcher import FetcherService, seed_default_sources
-from app.routes.articles import router
+from app.models import Article
+from app.routes.articles import invalidate_response_cache, router
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +22,9 @@ async def lifespan(app: FastAPI):
     # --- Startup ---
     logger.info("Creating database tables if they don't exist...")
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add any index introduced since they were created
+    for index in Article.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
     logger.info("Seeding default RSS sources...")
     seed_default_sources(SessionLocal)
@@ -30,7 +34,7 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting background RSS fetcher...")
     import asyncio
-    fetcher = FetcherService()
+    fetcher = FetcherService(on_saved=invalidate_response_cache)  # fresh articles must not wait out the cache TTL
     task = asyncio.create_task(fetcher.run(SessionLocal, classifier))
 
     yield
@@ -1,9 +1,10 @@
 import os
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-import requests
+import httpx
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -14,7 +15,9 @@ API_URL    = f"{_API_BASE}/articles"
 FETCH_URL  = f"{_API_BASE}/fetch"
 HEALTH_URL = f"{_API_BASE}/health"
 SOURCES_URL = f"{_API_BASE}/sources"
+ARTICLE_SOURCES_URL = f"{_API_BASE}/articles/sources"
 REFRESH_INTERVAL = 300  # seconds — matches fetcher interval
+ARTICLES_CACHE_TTL = 30  # seconds — reruns within this window reuse the last /articles response
 
 CATEGORIES = [
     "cybersecurity incident or data breach",
@@ -25,6 +28,13 @@ CATEGORIES = [
     "IT community discussion or advice request",
 ]
 
+# Sort option label → /articles ?sort= value
+SORT_OPTIONS = {
+    "Final score": "score",
+    "Importance":  "importance",
+    "Most recent": "recent",
+}
+
 CATEGORY_EMOJI = {
     "cybersecurity incident or data breach":     "🔴",
     "system outage or service disruption":       "🟠",
@@ -38,16 +48,25 @@ CATEGORY_EMOJI = {
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+@st.cache_resource
+def get_client() -> httpx.Client:
+    """
+    One pooled HTTP client for the whole Streamlit server, shared by every session and rerun,
+    so API calls reuse keep-alive connections instead of opening a new one each time.
+    """
+    return httpx.Client()
+
+
 def check_health() -> str:
     """
     Returns 'ready', 'loading', or 'unreachable'.
     'loading' means the API is up but the ML model hasn't finished loading yet.
     """
     try:
-        response = requests.get(HEALTH_URL, timeout=5)
+        response = get_client().get(HEALTH_URL, timeout=5)
         response.raise_for_status()
         return response.json().get("status", "unreachable")
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return "unreachable"
     except Exception:
         return "unreachable"
@@ -56,10 +75,10 @@ def check_health() -> str:
 def trigger_fetch() -> bool:
     """Call POST /fetch to run an immediate fetch+classify cycle. Returns True on success."""
     try:
-        response = requests.post(FETCH_URL, timeout=120)
+        response = get_client().post(FETCH_URL, timeout=120)
         response.raise_for_status()
         return True
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         st.error("Cannot reach the API at http://localhost:8000.")
         return False
     except Exception as e:
@@ -67,37 +86,87 @@ def trigger_fetch() -> bool:
         return False
 
 
-def get_articles() -> list[dict]:
-    """Fetch articles from the API. Returns an empty list and shows an error on failure."""
+@st.cache_data(ttl=ARTICLES_CACHE_TTL, show_spinner=False)
+def _fetch_articles(sort: str, categories: tuple[str, ...], sources: tuple[str, ...]) -> list[dict]:
+    """
+    GET /articles?sort=...&categories=...&sources=... Raises on failure so errors are never cached.
+    published_at is parsed here, once per response, into each article's "_published" key.
+    """
+    params = {"sort": sort, "categories": list(categories), "sources": list(sources)}
+    response = get_client().get(API_URL, params=params, timeout=30)
+    response.raise_for_status()
+    articles = response.json()
+    for a in articles:
+        a["_published"] = parse_published_at(a.get("published_at"))
+    return articles
+
+
+@st.cache_data(ttl=ARTICLES_CACHE_TTL, show_spinner=False)
+def _fetch_article_sources() -> list[str]:
+    """GET /articles/sources. Raises on failure so errors are never cached."""
+    response = get_client().get(ARTICLE_SOURCES_URL, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def clear_article_cache() -> None:
+    """Drop cached API responses, e.g. after a fetch has stored new articles."""
+    _fetch_articles.clear()
+    _fetch_article_sources.clear()
+
+
+def get_articles(sort: str = "score", categories=(), sources=()) -> list[dict]:
+    """
+    Fetch articles from the API, sorted and filtered by category / source server-side.
+    An empty categories or sources selection means no filter, as with the earlier client-side filter.
+    Returns an empty list and shows an error on failure.
+    """
     try:
-        response = requests.get(API_URL, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.ConnectionError:
+        return _fetch_articles(sort, tuple(categories), tuple(sources))
+    except httpx.ConnectError:
         return []
     except Exception as e:
         st.error(f"Failed to fetch articles: {e}")
         return []
 
 
-def time_ago(published_at: str) -> str:
-    """Convert a UTC ISO datetime string to a human-readable 'X ago' label."""
+def get_article_sources() -> list[str]:
+    """Sources that currently have articles, for the source filter. Returns an empty list on failure."""
+    try:
+        return _fetch_article_sources()
+    except Exception:
+        return []
+
+
+def parse_published_at(published_at: str | None) -> datetime | None:
+    """Parse a UTC ISO datetime string from the API into an aware datetime, or None if missing/invalid."""
     try:
         dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        seconds = max(0, int((datetime.now(timezone.utc) - dt).total_seconds()))
-        if seconds < 60:
-            return f"{seconds}s ago"
-        minutes = seconds // 60
-        if minutes < 60:
-            return f"{minutes}m ago"
-        hours = minutes // 60
-        if hours < 24:
-            return f"{hours}h ago"
-        return f"{hours // 24}d ago"
     except Exception:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def time_ago(age: timedelta | None) -> str:
+    """Convert an article age to a human-readable 'X ago' label."""
+    if age is None:
         return "unknown"
+    seconds = max(0, int(age.total_seconds()))
+    if seconds < 60:
+        return f"{seconds}s ago"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes}m ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours}h ago"
+    return f"{hours // 24}d ago"
+
+
+def age_of(article: dict, now: datetime) -> timedelta | None:
+    """Age of an article relative to now, from its pre-parsed published_at. None if it had no valid date."""
+    published = article.get("_published")
+    return now - published if published else None
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -137,7 +206,9 @@ if health in ("unreachable", "loading"):
 # Fetch data
 # ─────────────────────────────────────────────────────────────────────────────
 
-articles = get_articles()
+# Only the filter options are loaded here; the articles themselves are requested once the
+# filter widgets below have been drawn, so the API can sort and filter them.
+available_sources = get_article_sources()
 st.session_state.last_refresh = time.time()
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -150,6 +221,7 @@ with st.sidebar:
     if st.button("Refresh now", icon=":material/refresh:", use_container_width=True):
         with st.spinner("Fetching latest articles..."):
             trigger_fetch()
+        clear_article_cache()
         st.rerun()
 
     last_updated = datetime.fromtimestamp(st.session_state.last_refresh).strftime("%H:%M:%S")
@@ -166,16 +238,17 @@ with st.sidebar:
             if submitted:
                 if new_name and new_url:
                     try:
-                        resp = requests.post(SOURCES_URL,
-                                             json={"name": new_name, "feed_url": new_url},
-                                             timeout=15)
+                        resp = get_client().post(SOURCES_URL,
+                                                 json={"name": new_name, "feed_url": new_url},
+                                                 timeout=15)
                         if resp.status_code == 201:
                             with st.spinner(f"Fetching articles from '{new_name}'..."):
                                 trigger_fetch()
+                            clear_article_cache()
                             st.rerun()
                         else:
                             st.error(resp.json().get("detail", "Failed to add source."))
-                    except requests.exceptions.ConnectionError:
+                    except httpx.ConnectError:
                         st.error("Cannot reach the API.")
                 else:
                     st.warning("Both name and URL are required.")
@@ -186,8 +259,6 @@ st.title("📡 IT News Feed")
 # Filters + sort — inline, above the article list
 # ─────────────────────────────────────────────────────────────────────────────
 
-available_sources = sorted({a["source"] for a in articles}) if articles else []
-
 col_cat, col_src, col_kw, col_sort = st.columns([3, 2, 2, 2])
 
 with col_cat:
@@ -210,32 +281,24 @@ with col_kw:
 with col_sort:
     sort_by = st.radio(
         "Sort by",
-        options=["Final score", "Importance", "Most recent"],
+        options=list(SORT_OPTIONS),
     )
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Filter & sort
+# Fetch data — sorted and filtered by category / source on the server
 # ─────────────────────────────────────────────────────────────────────────────
 
+articles = get_articles(SORT_OPTIONS[sort_by], selected_categories, selected_sources)
+
 kw = keyword.lower()
 filtered = [
     a for a in articles
-    if (a.get("category") in selected_categories or not selected_categories)
-    and (a.get("source") in selected_sources or not selected_sources)
-    and (not kw or kw in (a.get("title") or "").lower() or kw in (a.get("body") or "").lower())
+    if not kw or kw in (a.get("title") or "").lower() or kw in (a.get("body") or "").lower()
 ]
 
-if sort_by == "Importance":
-    filtered.sort(key=lambda a: a.get("importance_score") or 0.0, reverse=True)
-elif sort_by == "Most recent":
-    filtered.sort(key=lambda a: a.get("published_at") or "", reverse=True)
-# "Final score" preserves the API order (final_score desc)
-
-if filtered:
-    most_recent_str = max(a.get("published_at") or "" for a in filtered)
-    age_label = time_ago(most_recent_str) if most_recent_str else "—"
-else:
-    age_label = "—"
+now = datetime.now(timezone.utc)  # one reference time for every age label on this render
+published = [a["_published"] for a in filtered if a.get("_published")]
+age_label = time_ago(now - max(published)) if published else "—"
 
 st.caption(f"**{len(filtered)}** articles &nbsp;·&nbsp; most recent: **{age_label}**")
 st.divider()
@@ -257,7 +320,6 @@ else:
         importance_score = float(article.get("importance_score") or 0.0)
         recency_score = float(article.get("recency_score") or 0.0)
         final_score = float(article.get("final_score") or 0.0)
-        published_at = article.get("published_at") or ""
 
         url = article.get("url") or ""
         title_md = f"[{title}]({url})" if url.startswith("http") else title
@@ -267,7 +329,7 @@ else:
             with left:
                 st.markdown(
                     f"{emoji} **{category}** &nbsp;·&nbsp; "
-                    f"`{source}` &nbsp;·&nbsp; *{time_ago(published_at)}*"
+                    f"`{source}` &nbsp;·&nbsp; *{time_ago(age_of(article, now))}*"
                 )
                 st.markdown(f"### {title_md}")
                 if snippet:
@@ -281,9 +343,8 @@ else:
             st.divider()
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Auto-refresh — sleep then rerun (page is already rendered above)
+# Auto-refresh — browser-side timer triggers the rerun, so no server thread sleeps
 # ─────────────────────────────────────────────────────────────────────────────
 
 if auto_refresh:
-    time.sleep(REFRESH_INTERVAL)
-    st.rerun()
+    st_autorefresh(interval=REFRESH_INTERVAL * 1000, key="feed_refresh")
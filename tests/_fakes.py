@@ -0,0 +1,56 @@
+"""
+Lightweight fakes for the classifier unit tests — plain objects that record calls in lists,
+much cheaper than MagicMock.
+"""
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+
+@dataclass
+class FakeDB:
+    """Session stand-in for classifier unit tests. `existing` holds the records already in the DB."""
+    dialect: str = "postgresql"
+    existing: list = field(default_factory=list)
+    gets: list = field(default_factory=list)      # primary keys passed to get()
+    queries: list = field(default_factory=list)   # statements passed to scalars()
+    executed: list = field(default_factory=list)  # (statement, parameters) passed to execute()
+    merged: list = field(default_factory=list)
+    committed: int = 0
+
+    def get(self, model, key):
+        self.gets.append(key)
+        return next((record for record in self.existing if record.id == key), None)
+
+    def scalars(self, statement):
+        self.queries.append(statement)
+        return list(self.existing)
+
+    def execute(self, statement, parameters=None):
+        self.executed.append((statement, parameters))
+
+    def merge(self, instance):
+        self.merged.append(instance)
+        return instance
+
+    def commit(self):
+        self.committed += 1
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name=self.dialect))
+
+
+@dataclass
+class FakePipeline:
+    """
+    Zero-shot pipeline stand-in. Returns `result` once per text (or `results` as given, if set)
+    and records every call as (inputs, kwargs).
+    """
+    result: dict | None = None
+    results: list | None = None
+    calls: list = field(default_factory=list)
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((inputs, kwargs))
+        if self.results is not None:
+            return self.results
+        return [self.result] * len(inputs) if isinstance(inputs, list) else self.result
@@ -0,0 +1,36 @@
+"""
+The minimal FastAPI app the route tests run against — just the articles router, no lifespan,
+no background fetcher. Built once per process and shared by every test module.
+"""
+from contextlib import contextmanager
+from functools import lru_cache
+
+from fastapi import FastAPI
+
+from app.database import get_db
+from app.routes.articles import router
+
+
+@lru_cache(maxsize=None)
+def make_test_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+@contextmanager
+def use_db(session):
+    """
+    Serve get_db from `session` on the shared test app, then put back whatever override was there.
+    Restoring instead of clearing lets a per-test override nest inside a session-scoped one.
+    """
+    overrides = make_test_app().dependency_overrides
+    previous = overrides.get(get_db)
+    overrides[get_db] = lambda: session
+    try:
+        yield
+    finally:
+        if previous is None:
+            del overrides[get_db]
+        else:
+            overrides[get_db] = previous
@@ -1,17 +1,30 @@
 import math
+import threading
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from app.classifier import (
+    CLASSIFICATION_CACHE_SIZE,
+    CLASSIFY_BATCH_SIZE,
     IMPORTANCE_THRESHOLD,
     LABEL_WEIGHTS,
+    MAX_SEQUENCE_LENGTH,
     RECENCY_LAMBDA,
+    WARMUP_TEXT,
     ClassifierService,
+    _build_pipeline,
+    _load_pipeline,
+    _quantization_target,
+    _reduce_kernel,
+    _reduce_numpy,
 )
 from app.models import Article
 from app.schemas import ArticleIngest
+from tests._fakes import FakeDB, FakePipeline
 
 
 # ---------------------------------------------------------------------------
@@ -31,15 +44,136 @@ def make_article(**kwargs) -> ArticleIngest:
     return ArticleIngest(**defaults)
 
 
-def mock_pipeline(labels, scores):
-    """Returns a mock callable that mimics the zero-shot pipeline output."""
-    pipe = MagicMock(return_value={"labels": labels, "scores": scores})
-    return pipe
+def mock_pipeline(labels, scores) -> FakePipeline:
+    """Returns a fake callable that mimics the zero-shot pipeline output (one result per text for list input)."""
+    return FakePipeline(result={"labels": labels, "scores": scores})
 
 
 LABELS = list(LABEL_WEIGHTS.keys())
 
 
+# ---------------------------------------------------------------------------
+# _get_pipeline
+# ---------------------------------------------------------------------------
+
+class TestGetPipeline:
+    @pytest.fixture(autouse=True)
+    def _cpu_only(self):
+        # Loading tests run as on a CPU-only host unless they patch _accelerator themselves
+        _build_pipeline.cache_clear()
+        with patch("app.classifier._accelerator", return_value=None):
+            yield
+        _build_pipeline.cache_clear()
+
+    def setup_method(self):
+        self.service = ClassifierService()
+
+    def test_uses_quantized_pipeline_when_available(self):
+        quantized = MagicMock()
+        with patch("app.classifier._load_quantized_pipeline", return_value=quantized):
+            assert self.service._get_pipeline() is quantized
+
+    def test_falls_back_to_fp32_when_optimum_missing(self):
+        fp32 = MagicMock()
+        transformers = MagicMock(pipeline=MagicMock(return_value=fp32))
+        zero_shot = MagicMock()
+        with patch("app.classifier._load_quantized_pipeline", side_effect=ImportError("optimum")), \
+             patch.dict("sys.modules", {"transformers": transformers, "app.zero_shot": zero_shot}):
+            assert self.service._get_pipeline() is fp32
+
+        transformers.pipeline.assert_called_once()
+        assert transformers.pipeline.call_args.kwargs["pipeline_class"] is zero_shot.CachedHypothesisZeroShotPipeline
+        # No accelerator: device and dtype are left to transformers' defaults
+        assert not {"device", "dtype"} & transformers.pipeline.call_args.kwargs.keys()
+
+    def test_gpu_gets_fp16_torch_pipeline_instead_of_onnx(self):
+        gpu = MagicMock()
+        with patch("app.classifier._accelerator", return_value=("cuda", "float16")), \
+             patch("app.classifier._load_torch_pipeline", return_value=gpu) as load_torch, \
+             patch("app.classifier._load_quantized_pipeline") as load_quantized:
+            assert self.service._get_pipeline() is gpu
+
+        load_quantized.assert_not_called()
+        assert load_torch.call_args.kwargs == {"device": "cuda", "dtype": "float16"}
+
+    def test_inputs_truncated_to_max_sequence_length(self):
+        with patch("app.classifier._load_quantized_pipeline", return_value=MagicMock()):
+            pipe = self.service._get_pipeline()
+
+        assert pipe.tokenizer.model_max_length == MAX_SEQUENCE_LENGTH
+
+    def test_kv_cache_disabled_on_model(self):
+        with patch("app.classifier._load_quantized_pipeline", return_value=MagicMock()):
+            pipe = self.service._get_pipeline()
+
+        assert pipe.model.config.use_cache is False
+
+    def test_load_runs_warmup_inference_before_ready(self):
+        ready_during_warmup = []
+        pipe = MagicMock(side_effect=lambda *args, **kwargs: ready_during_warmup.append(self.service.is_ready))
+        with patch("app.classifier._load_quantized_pipeline", return_value=pipe):
+            self.service.load()
+
+        assert pipe.call_args.args == ([WARMUP_TEXT],)
+        assert ready_during_warmup == [False]
+        assert self.service.is_ready
+        assert len(self.service._cache) == 0
+
+    def test_pipeline_is_loaded_once(self):
+        with patch("app.classifier._load_quantized_pipeline", return_value=MagicMock()) as mock_load:
+            self.service._get_pipeline()
+            self.service._get_pipeline()
+
+        mock_load.assert_called_once()
+
+    def test_concurrent_first_calls_load_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_load(model_id):
+            started.set()
+            release.wait(timeout=5)
+            return MagicMock()
+
+        with patch("app.classifier._load_quantized_pipeline", side_effect=slow_load) as mock_load:
+            pipes = []
+            threads = [threading.Thread(target=lambda: pipes.append(_load_pipeline("model"))) for _ in range(2)]
+            threads[0].start()
+            started.wait(timeout=5)  # the first thread is mid-load when the second one asks
+            threads[1].start()
+            release.set()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        mock_load.assert_called_once()
+        assert len(pipes) == 2 and pipes[0] is pipes[1]
+
+    def test_pipeline_shared_across_instances(self):
+        with patch("app.classifier._load_quantized_pipeline", return_value=MagicMock()) as mock_load:
+            first = ClassifierService()._get_pipeline()
+            second = ClassifierService()._get_pipeline()
+
+        assert first is second
+        mock_load.assert_called_once()
+
+
+class TestQuantizationTarget:
+    @pytest.mark.parametrize("flags, expected", [
+        ({"avx2", "avx512f", "avx512_vnni"}, "avx512_vnni"),
+        ({"avx2", "avx512f"}, "avx512"),
+        ({"avx2"}, "avx2"),
+        (set(), "avx2"),
+    ])
+    def test_picks_preset_from_x86_cpu_flags(self, flags, expected):
+        with patch("app.classifier.platform.machine", return_value="x86_64"), \
+             patch("app.classifier._cpu_flags", return_value=flags):
+            assert _quantization_target() == expected
+
+    def test_arm_uses_arm64_preset(self):
+        with patch("app.classifier.platform.machine", return_value="aarch64"):
+            assert _quantization_target() == "arm64"
+
+
 # ---------------------------------------------------------------------------
 # _compute_recency
 # ---------------------------------------------------------------------------
@@ -76,6 +210,17 @@ class TestComputeRecency:
         score = self.service._compute_recency(naive)
         assert 0.0 < score <= 1.0
 
+    def test_explicit_now_is_used_as_reference(self):
+        now = datetime(2025, 1, 3, 12, 0, tzinfo=timezone.utc)
+        score = self.service._compute_recency(now - timedelta(hours=48), now=now)
+        assert score == pytest.approx(0.5, abs=1e-6)
+
+    def test_non_utc_offset_is_converted_not_relabelled(self):
+        # 14:00+02:00 is 12:00 UTC, i.e. 48h before now
+        now = datetime(2025, 1, 3, 12, 0, tzinfo=timezone.utc)
+        published = datetime(2025, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+        assert self.service._compute_recency(published, now=now) == pytest.approx(0.5, abs=1e-6)
+
     def test_score_decreases_over_time(self):
         recent = datetime.now(timezone.utc) - timedelta(hours=10)
         older = datetime.now(timezone.utc) - timedelta(hours=50)
@@ -89,6 +234,64 @@ class TestComputeRecency:
         assert abs(score - expected) < 0.01
 
 
+# ---------------------------------------------------------------------------
+# recency_scores
+# ---------------------------------------------------------------------------
+
+class TestRecencyScores:
+    def setup_method(self):
+        self.service = ClassifierService()
+
+    def test_matches_scalar_formula(self):
+        now = datetime.now(timezone.utc)
+        published = [now, now - timedelta(hours=48), now - timedelta(hours=96)]
+        scores = self.service.recency_scores(published)
+
+        assert scores.shape == (3,)
+        assert abs(scores[0] - 1.0) < 0.01
+        assert abs(scores[1] - 0.5) < 0.01
+        assert abs(scores[2] - 0.25) < 0.01
+
+    def test_future_and_naive_datetimes(self):
+        future = datetime.now(timezone.utc) + timedelta(hours=10)
+        naive = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=24)
+        scores = self.service.recency_scores([future, naive])
+
+        assert scores[0] == 1.0
+        assert abs(scores[1] - math.exp(-RECENCY_LAMBDA * 24)) < 0.01
+
+    def test_explicit_now_matches_single_article_scores(self):
+        now = datetime(2025, 1, 3, 12, 0, tzinfo=timezone.utc)
+        published = [now - timedelta(hours=h) for h in (0, 12, 48, 200)]
+
+        batch = self.service.recency_scores(published, now=now)
+
+        assert batch.tolist() == [self.service._compute_recency(p, now=now) for p in published]
+
+    def test_non_utc_offset_is_converted_not_relabelled(self):
+        now = datetime(2025, 1, 3, 12, 0, tzinfo=timezone.utc)
+        published = [datetime(2025, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))]  # 12:00 UTC
+        assert self.service.recency_scores(published, now=now)[0] == pytest.approx(0.5, abs=1e-6)
+
+    def test_empty_input(self):
+        assert len(self.service.recency_scores([])) == 0
+
+    def test_lookup_table_stays_close_to_exact_decay(self):
+        now = datetime.now(timezone.utc)
+        hours = [0.1, 3.3, 13.0, 47.9, 100.6, 500.2]
+        scores = self.service.recency_scores([now - timedelta(hours=h) for h in hours])
+
+        for h, score in zip(hours, scores):
+            assert score == pytest.approx(math.exp(-RECENCY_LAMBDA * h), rel=0.002)
+
+    def test_very_old_articles_clamp_to_near_zero(self):
+        ancient = datetime.now(timezone.utc) - timedelta(days=365)
+        score = self.service.recency_scores([ancient])[0]
+
+        assert 0.0 < score < 1e-4
+        assert score == self.service._compute_recency(ancient)
+
+
 # ---------------------------------------------------------------------------
 # _compute_importance
 # ---------------------------------------------------------------------------
@@ -97,6 +300,14 @@ class TestComputeImportance:
     def setup_method(self):
         self.service = ClassifierService()
 
+    def test_all_label_pairs_sent_in_one_forward_pass(self):
+        pipe = mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            self.service._compute_importance("test")
+
+        assert pipe.calls[0][0] == ["test"]  # list input → batched iterator, not a per-label loop
+        assert pipe.calls[-1][1]["batch_size"] == len(LABELS)
+
     def test_high_security_confidence_gives_high_score(self):
         # 90% confidence on cybersecurity (weight=1.0) → should pass filter
         scores = [0.9, 0.04, 0.02, 0.02, 0.01, 0.01]
@@ -139,6 +350,17 @@ class TestComputeImportance:
 
         assert category == "system outage or service disruption"
 
+    def test_labels_in_confidence_order_are_mapped_back_correctly(self):
+        # The real pipeline returns labels sorted by score, not in LABEL_WEIGHTS order
+        labels = list(reversed(LABELS))  # "IT community discussion..." first, weight 0.15
+        scores = [0.7, 0.1, 0.1, 0.05, 0.03, 0.02]
+        expected = sum(score * LABEL_WEIGHTS[label] for label, score in zip(labels, scores))
+        with patch.object(self.service, "_get_pipeline", return_value=mock_pipeline(labels, scores)):
+            score, category = self.service._compute_importance("test")
+
+        assert abs(score - expected) < 1e-6
+        assert category == "IT community discussion or advice request"
+
     def test_score_is_within_expected_range(self):
         # Score must always be between min_weight (0.15) and max_weight (1.0)
         scores = [0.2, 0.2, 0.2, 0.2, 0.1, 0.1]
@@ -148,6 +370,140 @@ class TestComputeImportance:
         assert 0.0 <= score <= 1.0
 
 
+# ---------------------------------------------------------------------------
+# _compute_importance_batch
+# ---------------------------------------------------------------------------
+
+class TestComputeImportanceBatch:
+    def setup_method(self):
+        self.service = ClassifierService()
+
+    def test_single_pipeline_call_for_whole_batch(self):
+        results = [
+            {"labels": LABELS, "scores": [0.9, 0.04, 0.02, 0.02, 0.01, 0.01]},
+            {"labels": LABELS, "scores": [0.01, 0.01, 0.01, 0.01, 0.94, 0.02]},
+        ]
+        pipe = FakePipeline(results=results)
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            scored = self.service._compute_importance_batch(["breach", "new laptop"])
+
+        assert len(pipe.calls) == 1
+        assert pipe.calls[-1][0] == ["breach", "new laptop"]
+        assert scored[0][0] > IMPORTANCE_THRESHOLD
+        assert scored[0][1] == "cybersecurity incident or data breach"
+        assert scored[1][0] < IMPORTANCE_THRESHOLD
+        assert scored[1][1] == "general technology news"
+
+    def test_batch_weighting_matches_per_result_weighting(self):
+        # Each result has its own confidence order, as returned by the real pipeline
+        results = [
+            {"labels": LABELS, "scores": [0.5, 0.2, 0.1, 0.1, 0.05, 0.05]},
+            {"labels": LABELS[::-1], "scores": [0.6, 0.2, 0.1, 0.05, 0.03, 0.02]},
+            {"labels": LABELS[2:] + LABELS[:2], "scores": [0.3, 0.25, 0.2, 0.15, 0.06, 0.04]},
+        ]
+
+        batched = ClassifierService._weigh_batch(results)
+
+        for result, (score, category) in zip(results, batched):
+            weighted = {l: sc * LABEL_WEIGHTS[l] for l, sc in zip(result["labels"], result["scores"])}
+            assert score == pytest.approx(sum(weighted.values()))
+            assert category == max(weighted, key=weighted.get)
+
+    def test_reduce_kernel_matches_numpy_fallback(self):
+        rng = np.random.default_rng(0)
+        scores = rng.dirichlet(np.ones(len(LABELS)), size=20)
+        positions = np.array([rng.permutation(len(LABELS)) for _ in range(20)], dtype=np.int64)
+        weights = np.array(list(LABEL_WEIGHTS.values()), dtype=np.float32)
+
+        kernel_totals, kernel_categories = _reduce_kernel(scores, positions, weights)
+        numpy_totals, numpy_categories = _reduce_numpy(scores, positions, weights)
+
+        assert kernel_totals == pytest.approx(numpy_totals)
+        assert kernel_categories.tolist() == numpy_categories.tolist()
+
+    def test_duplicate_texts_classified_once(self):
+        pipe = mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            scored = self.service._compute_importance_batch(["breach", "outage", "breach"])
+
+        assert pipe.calls[-1][0] == ["breach", "outage"]
+        assert len(scored) == 3
+        assert scored[0] == scored[2]
+
+    def test_batch_size_covers_all_pairs_of_small_batches(self):
+        pipe = mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            self.service._compute_importance_batch(["a", "b"])
+            small = pipe.calls[-1][1]["batch_size"]
+            self.service._compute_importance_batch([f"text {i}" for i in range(100)])
+            large = pipe.calls[-1][1]["batch_size"]
+
+        assert small == 2 * len(LABELS)
+        assert large == CLASSIFY_BATCH_SIZE
+
+    def test_keyword_prefilter_off_by_default(self):
+        pipe = mock_pipeline(LABELS, [0.01, 0.01, 0.01, 0.01, 0.94, 0.02])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            self.service._compute_importance_batch(["Apple announces new MacBook Pro"])
+
+        assert pipe.calls[0][0] == ["Apple announces new MacBook Pro"]
+
+    def test_keyword_prefilter_skips_model_for_low_signal_texts(self):
+        service = ClassifierService(keyword_prefilter=True)
+        pipe = mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])
+        with patch.object(service, "_get_pipeline", return_value=pipe):
+            scored = service._compute_importance_batch(["Apple announces new MacBook Pro", "Major AWS outage"])
+
+        assert pipe.calls[0][0] == ["Major AWS outage"]
+        assert scored[0] == (LABEL_WEIGHTS["general technology news"], "general technology news")
+        assert scored[0][0] < IMPORTANCE_THRESHOLD
+        assert scored[1][1] == "cybersecurity incident or data breach"
+
+    def test_empty_batch_skips_model(self):
+        with patch.object(self.service, "_get_pipeline") as mock_get:
+            assert self.service._compute_importance_batch([]) == []
+
+        mock_get.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Classification cache
+# ---------------------------------------------------------------------------
+
+class TestClassificationCache:
+    def setup_method(self):
+        self.service = ClassifierService()
+
+    def test_repeated_text_skips_inference(self):
+        pipe = mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            first = self.service._compute_importance("AWS outage")
+            second = self.service._compute_importance("AWS outage")
+
+        assert first == second
+        assert len(pipe.calls) == 1
+
+    def test_batch_only_sends_uncached_texts_to_model(self):
+        with patch.object(self.service, "_get_pipeline",
+                          return_value=mock_pipeline(LABELS, [0.9, 0.04, 0.02, 0.02, 0.01, 0.01])):
+            cached = self.service._compute_importance("AWS outage")
+
+        pipe = FakePipeline(results=[{"labels": LABELS, "scores": [0.01, 0.01, 0.01, 0.01, 0.94, 0.02]}])
+        with patch.object(self.service, "_get_pipeline", return_value=pipe):
+            results = self.service._compute_importance_batch(["AWS outage", "new laptop"])
+
+        assert pipe.calls[-1][0] == ["new laptop"]
+        assert results[0] == cached
+        assert results[1][1] == "general technology news"
+
+    def test_cache_is_bounded(self):
+        for i in range(CLASSIFICATION_CACHE_SIZE + 10):
+            self.service._cache_put(str(i), (0.5, "general technology news"))
+
+        assert len(self.service._cache) == CLASSIFICATION_CACHE_SIZE
+        assert self.service._cache_get("0") is None  # oldest entries evicted first
+
+
 # ---------------------------------------------------------------------------
 # classify_and_save
 # ---------------------------------------------------------------------------
@@ -158,7 +514,7 @@ class TestClassifyAndSave:
 
     def test_saves_article_with_correct_scores(self):
         article = make_article()
-        db = MagicMock()
+        db = FakeDB()
 
         with patch.object(self.service, "_compute_importance", return_value=(0.8, "system outage or service disruption")):
             result = self.service.classify_and_save(article, db)
@@ -169,7 +525,7 @@ class TestClassifyAndSave:
 
     def test_is_filtered_false_when_below_threshold(self):
         article = make_article()
-        db = MagicMock()
+        db = FakeDB()
 
         with patch.object(self.service, "_compute_importance", return_value=(0.3, "general technology news")):
             result = self.service.classify_and_save(article, db)
@@ -178,31 +534,31 @@ class TestClassifyAndSave:
 
     def test_db_merge_and_commit_are_called(self):
         article = make_article()
-        db = MagicMock()
+        db = FakeDB()
 
         with patch.object(self.service, "_compute_importance", return_value=(0.8, "system outage or service disruption")):
             self.service.classify_and_save(article, db)
 
-        db.merge.assert_called_once()
-        db.commit.assert_called_once()
+        assert len(db.merged) == 1
+        assert db.committed == 1
 
     def test_saves_with_null_scores_on_classification_failure(self):
         # Even if the model crashes, the article must still be persisted
         article = make_article()
-        db = MagicMock()
+        db = FakeDB()
 
         with patch.object(self.service, "_compute_importance", side_effect=Exception("model error")):
             result = self.service.classify_and_save(article, db)
 
         assert result.importance_score is None
         assert result.is_filtered is False
-        db.merge.assert_called_once()  # still saved despite failure
-        db.commit.assert_called_once()
+        assert len(db.merged) == 1  # still saved despite failure
+        assert db.committed == 1
 
     def test_article_fields_are_persisted_correctly(self):
         published = datetime.now(timezone.utc)
         article = make_article(id="abc-123", source="ars-technica", title="Big Outage", published_at=published)
-        db = MagicMock()
+        db = FakeDB()
 
         with patch.object(self.service, "_compute_importance", return_value=(0.9, "system outage or service disruption")):
             result = self.service.classify_and_save(article, db)
@@ -236,47 +592,151 @@ class TestSkipIfUnchanged:
 
     def test_skips_classification_when_title_and_body_unchanged(self):
         article = make_article()
-        db = MagicMock()
-        db.get.return_value = self._existing(article)
+        db = FakeDB(existing=[self._existing(article)])
 
         with patch.object(self.service, "_compute_importance") as mock_imp:
             result = self.service.classify_and_save(article, db)
 
         mock_imp.assert_not_called()
-        db.merge.assert_not_called()
-        db.commit.assert_not_called()
+        assert db.merged == []
+        assert db.committed == 0
         assert result.importance_score == 0.7  # unchanged record returned as-is
 
     def test_reclassifies_when_title_changes(self):
         article = make_article(title="New Title")
-        db = MagicMock()
-        existing = self._existing(make_article(title="Old Title"))
-        db.get.return_value = existing
+        db = FakeDB(existing=[self._existing(make_article(title="Old Title"))])
 
         with patch.object(self.service, "_compute_importance", return_value=(0.8, "system outage or service disruption")) as mock_imp:
             self.service.classify_and_save(article, db)
 
         mock_imp.assert_called_once()
-        db.merge.assert_called_once()
+        assert len(db.merged) == 1
 
     def test_reclassifies_when_body_changes(self):
         article = make_article(body="new body content")
-        db = MagicMock()
-        existing = self._existing(make_article(body="old body content"))
-        db.get.return_value = existing
+        db = FakeDB(existing=[self._existing(make_article(body="old body content"))])
 
         with patch.object(self.service, "_compute_importance", return_value=(0.8, "system outage or service disruption")) as mock_imp:
             self.service.classify_and_save(article, db)
 
         mock_imp.assert_called_once()
-        db.merge.assert_called_once()
+        assert len(db.merged) == 1
 
     def test_classifies_new_article_when_no_existing_record(self):
         article = make_article()
-        db = MagicMock()
-        db.get.return_value = None  # no existing record
+        db = FakeDB()  # no existing record
 
         with patch.object(self.service, "_compute_importance", return_value=(0.8, "system outage or service disruption")) as mock_imp:
             self.service.classify_and_save(article, db)
 
-        mock_imp.assert_called_once()
\ No newline at end of file
+        mock_imp.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# classify_and_save_many
+# ---------------------------------------------------------------------------
+
+class TestClassifyAndSaveMany:
+    def setup_method(self):
+        self.service = ClassifierService()
+
+    def test_new_articles_classified_in_one_batch_and_upserted_once(self):
+        articles = [make_article(id=f"id-{i}", title=f"Article {i}") for i in range(3)]
+        db = FakeDB()
+        scores = [(0.8, "system outage or service disruption"), (0.3, "general technology news"), (0.9, "cybersecurity incident or data breach")]
+
+        with patch.object(self.service, "_compute_importance_batch", return_value=scores) as mock_batch:
+            results = self.service.classify_and_save_many(articles, db)
+
+        mock_batch.assert_called_once()
+        assert len(mock_batch.call_args.args[0]) == 3
+        assert [r.id for r in results] == ["id-0", "id-1", "id-2"]
+        assert [r.is_filtered for r in results] == [True, False, True]
+        assert len(db.executed) == 1  # single bulk upsert, no per-article merge
+        assert db.merged == []
+        assert db.committed == 1
+
+    def test_upsert_statement_targets_article_id(self):
+        db = FakeDB()
+        with patch.object(self.service, "_compute_importance_batch", return_value=[(0.8, "system outage or service disruption")]):
+            self.service.classify_and_save_many([make_article()], db)
+
+        sql = str(db.executed[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "ingested_at = excluded.ingested_at" not in sql  # original ingestion time is preserved
+
+    def test_rows_passed_as_executemany_parameters(self):
+        db = FakeDB()
+        articles = [make_article(id=f"a{i}") for i in range(3)]
+        scores = [(0.8, "system outage or service disruption")] * 3
+        with patch.object(self.service, "_compute_importance_batch", return_value=scores):
+            self.service.classify_and_save_many(articles, db)
+
+        stmt, rows = db.executed[0]
+        assert [row["id"] for row in rows] == ["a0", "a1", "a2"]
+        assert "VALUES (%(id)s" in str(stmt.compile(dialect=postgresql.dialect()))  # one parametrised row, not N
+
+    def test_duplicate_ids_in_batch_are_collapsed(self):
+        articles = [make_article(id="dup", title="First"), make_article(id="dup", title="Second")]
+        db = FakeDB("sqlite")
+        scores = [(0.8, "system outage or service disruption"), (0.9, "cybersecurity incident or data breach")]
+
+        with patch.object(self.service, "_compute_importance_batch", return_value=scores):
+            self.service.classify_and_save_many(articles, db)
+
+        rows = db.executed[0][1]
+        assert [row["title"] for row in rows] == ["Second"]
+
+    def test_unchanged_articles_are_skipped(self):
+        article = make_article()
+        db = FakeDB(existing=[Article(id=article.id, source=article.source, title=article.title,
+                                       body=article.body, published_at=article.published_at,
+                                       importance_score=0.7, is_filtered=True)])
+
+        with patch.object(self.service, "_compute_importance_batch") as mock_batch:
+            results = self.service.classify_and_save_many([article], db)
+
+        mock_batch.assert_not_called()
+        assert db.merged == []
+        assert db.committed == 0
+        assert results[0].importance_score == 0.7
+
+    def test_existing_records_loaded_in_one_query(self):
+        articles = [make_article(id=f"id-{i}") for i in range(5)]
+        db = FakeDB()
+        with patch.object(self.service, "_compute_importance_batch", return_value=[(0.8, "system outage or service disruption")] * 5):
+            self.service.classify_and_save_many(articles, db)
+
+        assert len(db.queries) == 1
+        assert db.gets == []
+        sql = str(db.queries[0].compile(dialect=postgresql.dialect()))
+        assert "WHERE articles.id IN" in sql
+
+    def test_saves_with_null_scores_on_batch_failure(self):
+        articles = [make_article(id="a"), make_article(id="b")]
+        db = FakeDB()
+
+        with patch.object(self.service, "_compute_importance_batch", side_effect=Exception("model error")), \
+             patch.object(self.service, "_get_pipeline", side_effect=Exception("model unavailable")):
+            results = self.service.classify_and_save_many(articles, db)
+
+        assert all(r.importance_score is None and r.is_filtered is False for r in results)
+        assert len(db.executed) == 1  # still saved despite failure
+        assert db.committed == 1
+
+    def test_failed_batch_retried_per_article(self):
+        articles = [make_article(id="good", title="AWS outage"), make_article(id="bad", title="Poison")]
+        db = FakeDB()
+
+        def classify(texts):
+            if "Poison" in texts:
+                raise ValueError("bad input")
+            return [(0.8, "system outage or service disruption")] * len(texts)
+
+        with patch.object(self.service, "_compute_importance_batch", side_effect=classify), \
+             patch.object(self.service, "_get_pipeline"):
+            results = self.service.classify_and_save_many(articles, db)
+
+        assert results[0].importance_score == 0.8
+        assert results[1].importance_score is None
+        assert len(db.executed) == 1
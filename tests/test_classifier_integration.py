@@ -7,7 +7,7 @@ The -s flag is needed to see the printed score table.
 """
 import pytest
 
-from app.classifier import ClassifierService, IMPORTANCE_THRESHOLD, LABEL_WEIGHTS
+from app.classifier import IMPORTANCE_THRESHOLD, LABEL_WEIGHTS
 
 pytestmark = pytest.mark.integration
 
@@ -29,8 +29,9 @@ SAMPLE_HEADLINES = [
 
 
 class TestClassifierModelIntegration:
-    def setup_method(self):
-        self.service = ClassifierService()
+    @pytest.fixture(autouse=True)
+    def _service(self, classifier_service):
+        self.service = classifier_service
 
     def test_print_classification_scores(self, capsys):
         """
@@ -42,8 +43,8 @@ class TestClassifierModelIntegration:
             print(f"  {'HEADLINE':<52} {'SCORE':>6}  {'STATUS':<6}  CATEGORY")
             print("=" * 85)
 
-            for headline, _ in SAMPLE_HEADLINES:
-                score, category = self.service._compute_importance(headline)
+            headlines = [h for h, _ in SAMPLE_HEADLINES]
+            for headline, (score, category) in zip(headlines, self.service._compute_importance_batch(headlines)):
                 status = "PASS" if score > IMPORTANCE_THRESHOLD else "FAIL"
                 short_cat = category.replace(" or ", "/")[:28]
                 print(f"  {headline[:52]:<52} {score:.3f}   {status:<6}  {short_cat}")
@@ -52,9 +53,8 @@ class TestClassifierModelIntegration:
 
     def test_scores_are_valid_floats_in_range(self):
         """Scores must always be floats within the expected weighted range [0.2, 1.0]."""
-        for headline, _ in SAMPLE_HEADLINES:
-            score, category = self.service._compute_importance(headline)
-
+        headlines = [h for h, _ in SAMPLE_HEADLINES]
+        for headline, (score, category) in zip(headlines, self.service._compute_importance_batch(headlines)):
             assert isinstance(score, float), \
                 f"Score for '{headline}' is not a float"
             assert 0.0 <= score <= 1.01, \
@@ -65,15 +65,13 @@ class TestClassifierModelIntegration:
     def test_clearly_relevant_headlines_pass_filter(self):
         """Headlines about outages and breaches should score above the threshold."""
         relevant = [h for h, expected in SAMPLE_HEADLINES if expected is True]
-        for headline in relevant:
-            score, _ = self.service._compute_importance(headline)
+        for headline, (score, _) in zip(relevant, self.service._compute_importance_batch(relevant)):
             assert score > IMPORTANCE_THRESHOLD, \
                 f"Expected '{headline}' to pass the filter but got score={score:.3f}"
 
     def test_clearly_irrelevant_headlines_fail_filter(self):
         """Headlines about product announcements and general news should score below threshold."""
         irrelevant = [h for h, expected in SAMPLE_HEADLINES if expected is False]
-        for headline in irrelevant:
-            score, _ = self.service._compute_importance(headline)
+        for headline, (score, _) in zip(irrelevant, self.service._compute_importance_batch(irrelevant)):
             assert score <= IMPORTANCE_THRESHOLD, \
                 f"Expected '{headline}' to fail the filter but got score={score:.3f}"
\ No newline at end of file
@@ -1,12 +1,18 @@
+import asyncio
+import threading
 import time
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from app.fetcher import (
     _DEFAULT_SOURCES,
+    FetcherService,
     RSSSource,
+    _strip_html,
     parse_date,
     strip_html,
 )
@@ -35,10 +41,8 @@ class MockEntry:
 
 
 def make_mock_feed(*entries):
-    """Wraps a list of MockEntry objects in a mock feedparser feed."""
-    feed = MagicMock()
-    feed.entries = list(entries)
-    return feed
+    """Wraps a list of MockEntry objects in a stand-in for a parsed feedparser feed."""
+    return SimpleNamespace(entries=list(entries))
 
 
 # ---------------------------------------------------------------------------
@@ -61,6 +65,26 @@ class TestStripHtml:
     def test_strips_nested_tags(self):
         assert strip_html("<div><span>text</span></div>") == "text"
 
+    def test_collapses_whitespace(self):
+        assert strip_html("<p>First line</p>\n\n   <p>second\tline</p>") == "First line second line"
+
+    def test_decodes_entities(self):
+        assert strip_html("<p>Q&amp;A &lt;today&gt;</p>") == "Q&A <today>"
+
+    def test_repeated_input_served_from_cache(self):
+        _strip_html.cache_clear()
+        strip_html("<p>cached</p>")
+        strip_html("<p>cached</p>")
+        assert _strip_html.cache_info().hits == 1
+
+    def test_regex_fallback_without_selectolax(self):
+        _strip_html.cache_clear()  # results cached from the selectolax path would mask the fallback
+        with patch("app.fetcher.LexborHTMLParser", None):
+            assert strip_html("<p>Hello <b>world</b></p>") == "Hello world"
+            assert strip_html("<p>Q&amp;A</p>\n  <p>next</p>") == "Q&A next"
+            assert strip_html(None) == ""
+        _strip_html.cache_clear()
+
 
 # ---------------------------------------------------------------------------
 # parse_date
@@ -89,6 +113,13 @@ class TestParseDate:
         assert isinstance(result, datetime)
         assert result.tzinfo == timezone.utc
 
+    def test_fallback_time_is_not_cached(self):
+        entry = MockEntry(id="x", title="x")
+        entry.published_parsed = None
+        first = parse_date(entry)
+        time.sleep(0.01)
+        assert parse_date(entry) > first
+
 
 # ---------------------------------------------------------------------------
 # RSSSource.fetch()
@@ -102,7 +133,25 @@ def make_rss_source(name="reddit-sysadmin", url="https://www.reddit.com/r/sysadm
     return s
 
 
+RSS_XML = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+  <item><guid>https://example.com/1</guid><title>AWS outage</title>
+        <link>https://example.com/1</link><description>&lt;p&gt;Details here&lt;/p&gt;</description></item>
+</channel></rss>"""
+
+
+def mock_client(handler=lambda request: httpx.Response(200, content=b"")):
+    """Stands in for the module's pooled client, serving requests from an in-process handler."""
+    return patch("app.fetcher._CLIENT", httpx.Client(transport=httpx.MockTransport(handler)))
+
+
 class TestRSSSourceFetch:
+    @pytest.fixture(autouse=True)
+    def _offline(self):
+        # feedparser.parse is mocked per test; the download itself just needs to succeed
+        with mock_client():
+            yield
+
     def test_returns_articles_with_correct_fields(self):
         source = make_rss_source()
         entry = MockEntry(id="https://example.com/1", title="AWS outage", summary="Details here")
@@ -146,6 +195,14 @@ class TestRSSSourceFetch:
 
         assert articles == []
 
+    def test_skips_feedparser_sanitizing(self):
+        source = make_rss_source()
+        with patch("feedparser.parse", return_value=make_mock_feed()) as parse:
+            source.fetch()
+
+        assert parse.call_args.kwargs["sanitize_html"] is False
+        assert parse.call_args.kwargs["resolve_relative_uris"] is False
+
     def test_multiple_entries_all_returned(self):
         source = make_rss_source()
         entries = [MockEntry(id=f"https://example.com/{i}", title=f"Article {i}") for i in range(5)]
@@ -154,6 +211,229 @@ class TestRSSSourceFetch:
 
         assert len(articles) == 5
 
+    def test_body_falls_back_to_content(self):
+        source = make_rss_source()
+        entry = MockEntry(id="x", title="x", content=[{"value": "<p>Full text</p>"}])
+        with patch("feedparser.parse", return_value=make_mock_feed(entry)):
+            articles = source.fetch()
+
+        assert articles[0].body == "Full text"
+
+    def test_subclass_body_fields_compiled_at_class_definition(self):
+        class FullTextSource(RSSSource):
+            source_name = "full-text"
+            feed_url = "https://example.com/full.rss"
+            body_fields = ("content", "summary")
+
+        entry = MockEntry(id="x", title="x", summary="Teaser", content=[{"value": "Full text"}])
+        with patch("feedparser.parse", return_value=make_mock_feed(entry)):
+            full_text = FullTextSource().fetch()
+            default = make_rss_source().fetch()
+
+        assert full_text[0].body == "Full text"
+        assert default[0].body == "Teaser"
+
+    def test_parses_downloaded_bytes(self):
+        source = make_rss_source()
+        with mock_client(lambda request: httpx.Response(200, content=RSS_XML)):
+            articles = source.fetch()
+
+        assert len(articles) == 1
+        assert articles[0].id == "https://example.com/1"
+        assert articles[0].body == "Details here"
+
+    def test_returns_empty_list_on_http_error(self):
+        with mock_client(lambda request: httpx.Response(503)):
+            assert make_rss_source().fetch() == []
+
+    def test_sends_stored_validators_and_skips_unchanged_feed(self):
+        source = make_rss_source()
+        validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 12:00:00 GMT"}
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=RSS_XML, headers=validators)
+
+        with mock_client(handler):
+            first = source.fetch()
+            source.commit_validators()  # as the fetch cycle does once the articles are stored
+            with patch("feedparser.parse") as parse:
+                second = source.fetch()
+
+        assert len(first) == 1
+        assert second == []
+        parse.assert_not_called()
+        assert "If-None-Match" not in seen[0]
+        assert seen[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 12:00:00 GMT"
+
+
+# ---------------------------------------------------------------------------
+# RSSSource.fetch_async() / concurrent fetch cycle
+# ---------------------------------------------------------------------------
+
+def fetch_with_transport(source: RSSSource, handler):
+    """Runs source.fetch_async() against an in-process HTTP handler instead of the network."""
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await source.fetch_async(client)
+    return asyncio.run(run())
+
+
+class TestRSSSourceFetchAsync:
+    def test_parses_downloaded_feed(self):
+        articles = fetch_with_transport(make_rss_source(), lambda request: httpx.Response(200, content=RSS_XML))
+
+        assert len(articles) == 1
+        assert articles[0].id == "https://example.com/1"
+        assert articles[0].source == "reddit-sysadmin"
+        assert articles[0].body == "Details here"
+
+    def test_parses_off_the_event_loop_thread(self):
+        source = make_rss_source()
+        parse_threads = []
+        parse_feed = source._parse_feed
+
+        def record_thread(feed):
+            parse_threads.append(threading.current_thread())
+            return parse_feed(feed)
+
+        with patch.object(source, "_parse_feed", record_thread):
+            articles = fetch_with_transport(source, lambda request: httpx.Response(200, content=RSS_XML))
+
+        assert len(articles) == 1
+        assert parse_threads and threading.current_thread() not in parse_threads  # loop runs on this thread
+
+    def test_returns_empty_list_on_http_error(self):
+        articles = fetch_with_transport(make_rss_source(), lambda request: httpx.Response(503))
+        assert articles == []
+
+    def test_conditional_get_returns_nothing_when_not_modified(self):
+        source = make_rss_source()
+        validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 12:00:00 GMT"}
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=RSS_XML, headers=validators)
+
+        first = fetch_with_transport(source, handler)
+        source.commit_validators()
+        second = fetch_with_transport(source, handler)
+
+        assert len(first) == 1
+        assert second == []
+        assert "If-None-Match" not in seen[0]
+        assert seen[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 12:00:00 GMT"
+
+
+async def fetch_one_article(self, client):
+    """Stands in for RSSSource.fetch_async: one article per source, no network."""
+    return [SimpleNamespace(source=self.source_name)]
+
+
+async def fetch_nothing(self, client):
+    """Stands in for RSSSource.fetch_async: an unchanged or empty feed."""
+    return []
+
+
+class TestFetchCycle:
+    def test_all_sources_classified_in_one_batch(self):
+        sources = [make_rss_source(name=f"src-{i}", url=f"https://example.com/{i}.rss") for i in range(3)]
+        classifier = MagicMock()
+        service = FetcherService()
+
+        with patch.object(service, "_load_sources", return_value=sources), \
+             patch.object(RSSSource, "fetch_async", fetch_one_article):
+            service._fetch_all(MagicMock(), classifier)
+
+        classifier.classify_and_save_many.assert_called_once()
+        articles = classifier.classify_and_save_many.call_args.args[0]
+        assert sorted(a.source for a in articles) == ["src-0", "src-1", "src-2"]
+
+    def test_classification_runs_off_the_event_loop_thread(self):
+        loop_thread = threading.current_thread()  # asyncio.run() drives the loop on the calling thread
+        classify_threads = []
+        classifier = MagicMock()
+        classifier.classify_and_save_many.side_effect = lambda articles, db: classify_threads.append(threading.current_thread())
+        service = FetcherService()
+
+        with patch.object(service, "_load_sources", return_value=[make_rss_source()]), \
+             patch.object(RSSSource, "fetch_async", fetch_one_article):
+            service._fetch_all(MagicMock(), classifier)
+
+        assert len(classify_threads) == 1
+        assert classify_threads[0] is not loop_thread
+
+    def test_on_saved_called_after_articles_are_stored(self):
+        events = []
+        classifier = MagicMock()
+        classifier.classify_and_save_many.side_effect = lambda articles, db: events.append("saved")
+        service = FetcherService(on_saved=lambda: events.append("on_saved"))
+
+        with patch.object(service, "_load_sources", return_value=[make_rss_source()]), \
+             patch.object(RSSSource, "fetch_async", fetch_one_article):
+            service._fetch_all(MagicMock(), classifier)
+
+        assert events == ["saved", "on_saved"]
+
+    def test_on_saved_skipped_when_nothing_was_fetched(self):
+        events = []
+        service = FetcherService(on_saved=lambda: events.append("on_saved"))
+
+        with patch.object(service, "_load_sources", return_value=[make_rss_source()]), \
+             patch.object(RSSSource, "fetch_async", fetch_nothing):
+            service._fetch_all(MagicMock(), MagicMock())
+
+        assert events == []
+
+    def test_validators_held_back_until_articles_are_saved(self):
+        validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 12:00:00 GMT"}
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=RSS_XML, headers=validators)
+
+        classifier = MagicMock()
+        classifier.classify_and_save_many.side_effect = [RuntimeError("database unavailable"), None]
+        service = FetcherService()
+
+        with patch.object(service, "_load_sources", return_value=[make_rss_source()]), \
+             patch.dict("app.fetcher.HTTP_CLIENT_OPTIONS", {"transport": httpx.MockTransport(handler)}):
+            with pytest.raises(RuntimeError):
+                service._fetch_all(MagicMock(), classifier)
+            service._fetch_all(MagicMock(), classifier)
+            service._fetch_all(MagicMock(), classifier)
+
+        assert "If-None-Match" not in seen[1]  # the failed save must not turn the retry into a 304
+        assert seen[2]["If-None-Match"] == '"v1"'
+        assert classifier.classify_and_save_many.call_count == 2
+
+    def test_sources_reused_across_cycles(self):
+        db = MagicMock()
+        db.query.return_value.all.return_value = [MagicMock(name="row", feed_url="https://example.com/a.rss")]
+        service = FetcherService()
+
+        first = service._load_sources(lambda: db)
+        second = service._load_sources(lambda: db)
+
+        assert first[0] is second[0]  # keeps its ETag / Last-Modified between cycles
+
+    def test_no_classification_when_nothing_fetched(self):
+        classifier = MagicMock()
+        service = FetcherService()
+        with patch.object(service, "_load_sources", return_value=[]):
+            service._fetch_all(MagicMock(), classifier)
+
+        classifier.classify_and_save_many.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # _DEFAULT_SOURCES registry
@@ -4,21 +4,20 @@ No model loading, no network calls. Fast.
 
 Run with: pytest tests/test_routes.py -v
 """
-from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
-from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
-from app.database import Base, get_db
 from app.models import Article
-from app.routes.articles import router
+from app.routes import articles
+from tests._testapp import make_test_app, use_db
 
-# Minimal test app — no lifespan, no background fetcher
-_app = FastAPI()
-_app.include_router(router)
+_app = make_test_app()
 
 
 # ---------------------------------------------------------------------------
@@ -27,58 +26,84 @@ _app.include_router(router)
 
 @pytest.fixture
 def db(pg_engine):
-    Session = sessionmaker(autocommit=False, autoflush=False, bind=pg_engine)
-    session = Session()
+    """
+    A session joined to an outer transaction that is rolled back after the test, so no rows
+    outlive it and no per-test cleanup DML is needed. commit() inside the test (by the routes or
+    insert_article) only releases a SAVEPOINT.
+    """
+    connection = pg_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     yield session
     session.close()
-    # Delete all rows after each test to keep tests isolated
-    with pg_engine.connect() as conn:
-        for table in reversed(Base.metadata.sorted_tables):
-            conn.execute(table.delete())
-        conn.commit()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def http_client():
+    """One TestClient for the module; tests only swap the DB override."""
+    return TestClient(_app)
 
 
 @pytest.fixture
-def client(db):
-    _app.dependency_overrides[get_db] = lambda: db
-    yield TestClient(_app)
-    _app.dependency_overrides.clear()
+def client(http_client, db):
+    articles.invalidate_response_cache()  # responses cached by a previous test must not leak in
+    with use_db(db):
+        yield http_client
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_BASE_PAYLOAD = {
+    "id": "test-id-1",
+    "source": "test-source",
+    "title": "Test Article",
+    "body": None,
+    "published_at": "2025-01-01T12:00:00Z",
+}
+
+# Request body for tests that only need an ordinary batch, serialised once for the module
+_FIVE_PAYLOADS_JSON = json.dumps(
+    [{**_BASE_PAYLOAD, "id": f"id-{i}", "title": f"Article {i}"} for i in range(5)]
+).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Fields every endpoint returns, and the classification fields /retrieve must not leak
+_CONTRACT_FIELDS = {"id", "source", "title", "body", "published_at"}
+_CLASSIFICATION_FIELDS = {"importance_score", "recency_score", "final_score", "category", "is_filtered"}
+
+
 def make_payload(**kwargs) -> dict:
     """Returns a valid article payload dict, overridable via kwargs."""
-    defaults = {
-        "id": "test-id-1",
-        "source": "test-source",
-        "title": "Test Article",
-        "body": None,
-        "published_at": "2025-01-01T12:00:00Z",
-    }
-    defaults.update(kwargs)
-    return defaults
-
-
-def insert_article(db, **kwargs) -> Article:
-    """Insert an Article directly into the DB, bypassing the classifier."""
-    defaults = {
-        "id": "article-1",
-        "source": "test-source",
-        "title": "Test Article",
-        "body": None,
-        "published_at": datetime.now(timezone.utc),
-        "importance_score": 0.8,
-        "is_filtered": True,
-        "category": "system outage or service disruption",
-    }
-    defaults.update(kwargs)
-    article = Article(**defaults)
-    db.add(article)
+    return {**_BASE_PAYLOAD, **kwargs}
+
+
+# Column values for insert_articles rows. published_at is taken once at import, which is
+# recent enough for recency ≈ 1.0 throughout the run.
+_ARTICLE_DEFAULTS = {
+    "id": "article-1",
+    "source": "test-source",
+    "title": "Test Article",
+    "body": None,
+    "published_at": datetime.now(timezone.utc),
+    "importance_score": 0.8,
+    "is_filtered": True,
+    "category": "system outage or service disruption",
+}
+
+
+def insert_articles(db, *overrides: dict) -> None:
+    """Insert Articles directly into the DB in one executemany and one commit, bypassing the classifier."""
+    db.execute(insert(Article), [{**_ARTICLE_DEFAULTS, **row} for row in overrides])
     db.commit()
-    return article
+
+
+def insert_article(db, **kwargs) -> None:
+    """Insert a single Article, see insert_articles."""
+    insert_articles(db, kwargs)
 
 
 # ---------------------------------------------------------------------------
@@ -86,22 +111,42 @@ def insert_article(db, **kwargs) -> Article:
 # ---------------------------------------------------------------------------
 
 class TestIngest:
+    @pytest.fixture(autouse=True)
+    def classified(self):
+        """
+        Swaps classify_and_save_many for a plain recorder of the batches it receives.
+        A direct attribute swap is much cheaper than patch() with a MagicMock.
+        """
+        batches = []
+        articles.classifier.classify_and_save_many = lambda batch, db: batches.append(batch)
+        yield batches
+        del articles.classifier.classify_and_save_many  # the class method shows through again
+
     def test_returns_200_and_acknowledgment(self, client, db):
-        with patch("app.routes.articles.classifier.classify_and_save") as mock_cls:
-            mock_cls.return_value = MagicMock()
-            response = client.post("/ingest", json=[make_payload()])
+        response = client.post("/ingest", json=[make_payload()])
 
         assert response.status_code == 200
         assert response.json()["status"] == "ok"
         assert response.json()["received"] == 1
 
-    def test_classify_and_save_called_for_each_article(self, client, db):
+    def test_whole_batch_classified_in_one_call(self, client, db, classified):
         payload = [make_payload(id=f"id-{i}") for i in range(3)]
-        with patch("app.routes.articles.classifier.classify_and_save") as mock_cls:
-            mock_cls.return_value = MagicMock()
-            client.post("/ingest", json=payload)
+        client.post("/ingest", json=payload)
+
+        assert len(classified) == 1
+        assert [a.id for a in classified[0]] == ["id-0", "id-1", "id-2"]
 
-        assert mock_cls.call_count == 3
+    def test_published_at_normalised_to_utc(self, client, db, classified):
+        payload = [
+            make_payload(id="offset", published_at="2025-01-01T14:00:00+02:00"),
+            make_payload(id="naive", published_at="2025-01-01T12:00:00"),
+        ]
+        client.post("/ingest", json=payload)
+
+        expected = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        for article in classified[0]:
+            assert article.published_at == expected
+            assert article.published_at.tzinfo == timezone.utc
 
     def test_empty_batch_returns_zero_count(self, client, db):
         response = client.post("/ingest", json=[])
@@ -115,19 +160,14 @@ class TestIngest:
         assert response.status_code == 422
 
     def test_batch_of_five_articles_accepted(self, client, db):
-        payload = [make_payload(id=f"id-{i}", title=f"Article {i}") for i in range(5)]
-        with patch("app.routes.articles.classifier.classify_and_save") as mock_cls:
-            mock_cls.return_value = MagicMock()
-            response = client.post("/ingest", json=payload)
+        response = client.post("/ingest", content=_FIVE_PAYLOADS_JSON, headers=_JSON_HEADERS)
 
         assert response.status_code == 200
         assert response.json()["received"] == 5
 
     def test_body_field_is_optional(self, client, db):
         payload = [make_payload(body=None)]
-        with patch("app.routes.articles.classifier.classify_and_save") as mock_cls:
-            mock_cls.return_value = MagicMock()
-            response = client.post("/ingest", json=payload)
+        response = client.post("/ingest", json=payload)
 
         assert response.status_code == 200
 
@@ -138,8 +178,11 @@ class TestIngest:
 
 class TestRetrieve:
     def test_returns_only_filtered_articles(self, client, db):
-        insert_article(db, id="keep", is_filtered=True)
-        insert_article(db, id="drop", is_filtered=False)
+        insert_articles(
+            db,
+            {"id": "keep", "is_filtered": True},
+            {"id": "drop", "is_filtered": False},
+        )
 
         ids = [a["id"] for a in client.get("/retrieve").json()]
 
@@ -149,9 +192,12 @@ class TestRetrieve:
     def test_sorted_by_final_score_descending(self, client, db):
         # All articles are published now (recency ≈ 1.0), so ordering is driven by importance_score
         now = datetime.now(timezone.utc)
-        insert_article(db, id="low",  is_filtered=True, importance_score=0.3, published_at=now)
-        insert_article(db, id="high", is_filtered=True, importance_score=0.9, published_at=now)
-        insert_article(db, id="mid",  is_filtered=True, importance_score=0.6, published_at=now)
+        insert_articles(
+            db,
+            {"id": "low", "is_filtered": True, "importance_score": 0.3, "published_at": now},
+            {"id": "high", "is_filtered": True, "importance_score": 0.9, "published_at": now},
+            {"id": "mid", "is_filtered": True, "importance_score": 0.6, "published_at": now},
+        )
 
         ids = [a["id"] for a in client.get("/retrieve").json()]
 
@@ -162,31 +208,11 @@ class TestRetrieve:
         assert response.status_code == 200
         assert response.json() == []
 
-    def test_response_contains_all_contract_fields(self, client, db):
-        insert_article(db, id="article-1")
-        article = client.get("/retrieve").json()[0]
-
-        assert "id" in article
-        assert "source" in article
-        assert "title" in article
-        assert "body" in article
-        assert "published_at" in article
-
-    def test_response_does_not_contain_classification_fields(self, client, db):
-        insert_article(db, id="article-1")
-        article = client.get("/retrieve").json()[0]
-
-        assert "importance_score" not in article
-        assert "recency_score" not in article
-        assert "final_score" not in article
-        assert "category" not in article
-        assert "is_filtered" not in article
-
     def test_response_shape_is_exactly_contract(self, client, db):
         insert_article(db, id="article-1")
         article = client.get("/retrieve").json()[0]
 
-        assert set(article.keys()) == {"id", "source", "title", "body", "published_at"}
+        assert set(article.keys()) == _CONTRACT_FIELDS
 
 
 # ---------------------------------------------------------------------------
@@ -206,8 +232,11 @@ class TestArticlesFull:
         assert 0.0 < article["final_score"] <= 1.0
 
     def test_excludes_non_filtered_articles(self, client, db):
-        insert_article(db, id="filtered",     is_filtered=True)
-        insert_article(db, id="not-filtered", is_filtered=False)
+        insert_articles(
+            db,
+            {"id": "filtered", "is_filtered": True},
+            {"id": "not-filtered", "is_filtered": False},
+        )
 
         ids = [a["id"] for a in client.get("/articles").json()]
 
@@ -216,26 +245,170 @@ class TestArticlesFull:
 
     def test_same_ordering_as_retrieve(self, client, db):
         now = datetime.now(timezone.utc)
-        insert_article(db, id="low",  is_filtered=True, importance_score=0.3, published_at=now)
-        insert_article(db, id="high", is_filtered=True, importance_score=0.9, published_at=now)
+        insert_articles(
+            db,
+            {"id": "low", "is_filtered": True, "importance_score": 0.3, "published_at": now},
+            {"id": "high", "is_filtered": True, "importance_score": 0.9, "published_at": now},
+        )
 
         retrieve_ids = [a["id"] for a in client.get("/retrieve").json()]
         articles_ids = [a["id"] for a in client.get("/articles").json()]
 
         assert retrieve_ids == articles_ids
 
-    def test_also_contains_base_contract_fields(self, client, db):
-        insert_article(db, id="article-1")
-        article = client.get("/articles").json()[0]
 
-        assert "id" in article
-        assert "source" in article
-        assert "title" in article
-        assert "body" in article
-        assert "published_at" in article
+# ---------------------------------------------------------------------------
+# Response fields — one insert and one GET per endpoint
+# ---------------------------------------------------------------------------
 
-    def test_ingested_at_is_present(self, client, db):
+class TestResponseFields:
+    @pytest.mark.parametrize("path, present, absent", [
+        ("/retrieve", _CONTRACT_FIELDS, _CLASSIFICATION_FIELDS),
+        ("/articles", _CONTRACT_FIELDS | {"ingested_at"}, {"is_filtered"}),
+    ])
+    def test_contract_fields(self, client, db, path, present, absent):
         insert_article(db, id="article-1")
-        article = client.get("/articles").json()[0]
+        keys = client.get(path).json()[0].keys()
+
+        assert present <= keys
+        assert absent.isdisjoint(keys)
+
+
+# ---------------------------------------------------------------------------
+# ?sort= and ?limit=
+# ---------------------------------------------------------------------------
+
+class TestSortAndLimit:
+    def test_sort_recent_orders_by_published_at(self, client, db):
+        now = datetime.now(timezone.utc)
+        insert_articles(
+            db,
+            {"id": "old", "importance_score": 0.9, "published_at": now - timedelta(hours=48)},
+            {"id": "new", "importance_score": 0.2, "published_at": now},
+        )
+
+        ids = [a["id"] for a in client.get("/retrieve?sort=recent").json()]
+
+        assert ids == ["new", "old"]
+
+    def test_sort_importance_orders_by_importance_score(self, client, db):
+        now = datetime.now(timezone.utc)
+        insert_articles(
+            db,
+            {"id": "fresh-low", "importance_score": 0.3, "published_at": now},
+            {"id": "stale-high", "importance_score": 0.9, "published_at": now - timedelta(hours=48)},
+        )
+
+        ids = [a["id"] for a in client.get("/articles?sort=importance").json()]
+
+        assert ids == ["stale-high", "fresh-low"]
+
+    def test_limit_caps_result_for_every_sort(self, client, db):
+        insert_articles(db, *({"id": f"a{i}", "importance_score": 0.5 + i / 10} for i in range(5)))
+
+        for sort in ("score", "importance", "recent"):
+            assert len(client.get(f"/articles?sort={sort}&limit=2").json()) == 2
+
+    def test_limit_keeps_top_final_scores(self, client, db):
+        insert_articles(db, *({"id": f"a{i}", "importance_score": 0.5 + i / 10} for i in range(5)))
+
+        ids = [a["id"] for a in client.get("/retrieve?limit=2").json()]
+
+        assert ids == ["a4", "a3"]
+
+    def test_invalid_sort_returns_422(self, client, db):
+        assert client.get("/retrieve?sort=alphabetical").status_code == 422
+
+    def test_non_positive_limit_returns_422(self, client, db):
+        assert client.get("/articles?limit=0").status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# ?categories= / ?sources= and GET /articles/sources
+# ---------------------------------------------------------------------------
+
+class TestServerSideFilters:
+    def test_filters_by_category(self, client, db):
+        insert_articles(
+            db,
+            {"id": "outage", "category": "system outage or service disruption"},
+            {"id": "breach", "category": "cybersecurity incident or data breach"},
+            {"id": "release", "category": "software release or patch"},
+        )
+
+        response = client.get("/articles", params={"categories": [
+            "system outage or service disruption", "cybersecurity incident or data breach",
+        ]})
+
+        assert {a["id"] for a in response.json()} == {"outage", "breach"}
+
+    def test_filters_by_source(self, client, db):
+        insert_articles(
+            db,
+            {"id": "a", "source": "ars-technica"},
+            {"id": "b", "source": "reddit-sysadmin"},
+        )
+
+        response = client.get("/articles", params={"sources": ["reddit-sysadmin"]})
+
+        assert [a["id"] for a in response.json()] == ["b"]
+
+    def test_filters_combine(self, client, db):
+        insert_articles(
+            db,
+            {"id": "a", "source": "ars-technica", "category": "software release or patch"},
+            {"id": "b", "source": "ars-technica", "category": "system outage or service disruption"},
+            {"id": "c", "source": "reddit-sysadmin", "category": "software release or patch"},
+        )
+
+        response = client.get("/articles", params={
+            "sources": ["ars-technica"], "categories": ["software release or patch"],
+        })
+
+        assert [a["id"] for a in response.json()] == ["a"]
+
+    def test_sources_endpoint_lists_distinct_filtered_sources(self, client, db):
+        insert_articles(
+            db,
+            {"id": "a", "source": "the-hacker-news"},
+            {"id": "b", "source": "ars-technica"},
+            {"id": "c", "source": "ars-technica"},
+            {"id": "d", "source": "toms-hardware", "is_filtered": False},
+        )
+
+        assert client.get("/articles/sources").json() == ["ars-technica", "the-hacker-news"]
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+class TestResponseCache:
+    def test_repeated_get_is_served_from_cache(self, client, db):
+        insert_article(db, id="first")
+        client.get("/retrieve")
+        insert_article(db, id="second")  # written behind the API's back — not visible until the TTL expires
+
+        ids = [a["id"] for a in client.get("/retrieve").json()]
+
+        assert ids == ["first"]
+
+    def test_ingest_invalidates_cache(self, client, db):
+        insert_article(db, id="first")
+        client.get("/articles")
+        insert_article(db, id="second")
+
+        with patch("app.routes.articles.classifier.classify_and_save_many", new=lambda articles, db: None):
+            client.post("/ingest", json=[make_payload()])
+
+        ids = {a["id"] for a in client.get("/articles").json()}
+        assert ids == {"first", "second"}
+
+    def test_response_built_across_an_invalidation_is_not_cached(self):
+        def build_during_write():
+            articles.invalidate_response_cache()  # e.g. /ingest commits while this body is being built
+            return b"[]"
+
+        articles._cached_json("key", build_during_write)
 
-        assert "ingested_at" in article
\ No newline at end of file
+        assert "key" not in articles._response_cache
@@ -6,19 +6,22 @@ The first run will load the model (~300MB). Subsequent runs use the cache.
 
 Run with: pytest tests/test_routes_integration.py -v
 """
+import json
+
 import pytest
-from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
 
-from app.database import Base, get_db
-from app.routes.articles import router
+from app.database import Base
+from app.models import Article
+from app.routes.articles import invalidate_response_cache
+from tests._testapp import make_test_app, use_db
 
-pytestmark = pytest.mark.integration
+# Keeps the module on one worker under -n, so the test data is classified by one ingest, not one per worker
+pytestmark = [pytest.mark.integration, pytest.mark.xdist_group("routes-integration")]
 
-# Minimal test app — no lifespan, no background fetcher
-_app = FastAPI()
-_app.include_router(router)
+_app = make_test_app()
 
 # ---------------------------------------------------------------------------
 # Test data — mix of clearly relevant and clearly irrelevant headlines
@@ -55,46 +58,81 @@ IRRELEVANT_BATCH = [
     },
 ]
 
+# Request bodies, serialised once for the module instead of by httpx on every post
+_INGEST_JSON = json.dumps(RELEVANT_BATCH + IRRELEVANT_BATCH).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
+
+_RELEVANT_IDS = frozenset(a["id"] for a in RELEVANT_BATCH)
+_IRRELEVANT_IDS = frozenset(a["id"] for a in IRRELEVANT_BATCH)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def count_articles(engine, *any_of) -> int:
+    """Count the stored articles matching any of the given conditions (all of them if none), in one SQL aggregate."""
+    stmt = select(func.count()).select_from(Article)
+    if any_of:
+        stmt = stmt.where(or_(*any_of))
+    with engine.connect() as conn:
+        return conn.execute(stmt).scalar_one()
+
 
 # ---------------------------------------------------------------------------
-# Module-scoped fixture — ingests all test data once, model loaded once
+# Fixtures — model, DB session and TestClient once per session, test data once per module
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="session")
+def api_client(pg_engine, warm_classifier):
+    """A TestClient wired to a test DB session, built once for the whole session."""
+    db = Session(bind=pg_engine, autoflush=False)
+
+    with use_db(db):
+        yield TestClient(_app)
+
+    db.close()
+
+
 @pytest.fixture(scope="module")
-def populated_client(pg_engine):
-    """
-    Ingests all test batches via the API once per module and yields a ready-to-query TestClient.
-    Model is loaded once for the entire module.
-    """
-    Session = sessionmaker(autocommit=False, autoflush=False, bind=pg_engine)
-    db = Session()
-
-    _app.dependency_overrides[get_db] = lambda: db
-    client = TestClient(_app)
-
-    response = client.post("/ingest", json=RELEVANT_BATCH + IRRELEVANT_BATCH)
+def ingest_response(api_client, pg_engine):
+    """Ingests all test batches via the API once per module and yields the /ingest response."""
+    response = api_client.post("/ingest", content=_INGEST_JSON, headers=_JSON_HEADERS)
     assert response.status_code == 200, "Ingest during setup failed"
 
-    yield client
+    yield response
 
-    db.close()
-    _app.dependency_overrides.clear()
     with pg_engine.connect() as conn:
         for table in reversed(Base.metadata.sorted_tables):
             conn.execute(table.delete())
         conn.commit()
 
 
+@pytest.fixture(scope="module")
+def populated_client(api_client, ingest_response):
+    """The client, once the module's test data has been ingested."""
+    return api_client
+
+
+# The data never changes after the module's ingest, so each endpoint is requested once
+@pytest.fixture(scope="module")
+def retrieve_json(populated_client):
+    return populated_client.get("/retrieve").json()
+
+
+@pytest.fixture(scope="module")
+def articles_json(populated_client):
+    return populated_client.get("/articles").json()
+
+
 # ---------------------------------------------------------------------------
 # Ingest
 # ---------------------------------------------------------------------------
 
 class TestIngestIntegration:
-    def test_ingest_returns_correct_count(self, populated_client):
-        # Re-ingest is an upsert — won't create duplicates, just verifies the endpoint
-        response = populated_client.post("/ingest", json=RELEVANT_BATCH)
-        assert response.status_code == 200
-        assert response.json()["received"] == len(RELEVANT_BATCH)
+    def test_ingest_returns_correct_count(self, ingest_response):
+        # Checks the setup ingest rather than posting again, which would re-run the classifier
+        assert ingest_response.json()["received"] == len(RELEVANT_BATCH) + len(IRRELEVANT_BATCH)
 
 
 # ---------------------------------------------------------------------------
@@ -102,34 +140,31 @@ class TestIngestIntegration:
 # ---------------------------------------------------------------------------
 
 class TestRetrieveIntegration:
-    def test_relevant_articles_are_returned(self, populated_client):
-        ids = {a["id"] for a in populated_client.get("/retrieve").json()}
-        for article in RELEVANT_BATCH:
-            assert article["id"] in ids, \
-                f"Expected relevant article '{article['id']}' to be in /retrieve"
-
-    def test_irrelevant_articles_are_excluded(self, populated_client):
-        ids = {a["id"] for a in populated_client.get("/retrieve").json()}
-        for article in IRRELEVANT_BATCH:
-            assert article["id"] not in ids, \
-                f"Expected irrelevant article '{article['id']}' to be excluded from /retrieve"
+    def test_relevant_articles_are_returned(self, retrieve_json):
+        ids = {a["id"] for a in retrieve_json}
+        assert _RELEVANT_IDS <= ids, \
+            f"Expected relevant articles {sorted(_RELEVANT_IDS - ids)} to be in /retrieve"
+
+    def test_irrelevant_articles_are_excluded(self, retrieve_json):
+        ids = {a["id"] for a in retrieve_json}
+        assert _IRRELEVANT_IDS.isdisjoint(ids), \
+            f"Expected irrelevant articles {sorted(_IRRELEVANT_IDS & ids)} to be excluded from /retrieve"
 
     def test_retrieve_is_deterministic(self, populated_client):
         first  = populated_client.get("/retrieve").json()
+        invalidate_response_cache()  # the second call must be ranked again, not replayed from the cache
         second = populated_client.get("/retrieve").json()
         assert first == second, "/retrieve must return the same result on repeated calls"
 
-    def test_retrieve_sorted_by_score_descending(self, populated_client):
+    def test_retrieve_sorted_by_score_descending(self, articles_json):
         # Use /articles (which exposes scores) to verify the ordering from /retrieve
-        articles = populated_client.get("/articles").json()
-        scores = [a["final_score"] for a in articles]
+        scores = [a["final_score"] for a in articles_json]
         assert scores == sorted(scores, reverse=True), \
             "Articles must be sorted by final_score descending"
 
-    def test_retrieve_response_shape_matches_contract(self, populated_client):
-        articles = populated_client.get("/retrieve").json()
-        assert len(articles) > 0
-        for article in articles:
+    def test_retrieve_response_shape_matches_contract(self, retrieve_json):
+        assert len(retrieve_json) > 0
+        for article in retrieve_json:
             assert set(article.keys()) == {"id", "source", "title", "body", "published_at"}, \
                 f"Unexpected fields in /retrieve response: {set(article.keys())}"
 
@@ -139,22 +174,20 @@ class TestRetrieveIntegration:
 # ---------------------------------------------------------------------------
 
 class TestArticlesFullIntegration:
-    def test_scores_are_populated(self, populated_client):
-        articles = populated_client.get("/articles").json()
-        assert len(articles) > 0
-        for article in articles:
-            assert article["importance_score"] is not None
+    def test_scores_are_populated(self, articles_json, pg_engine):
+        assert len(articles_json) > 0
+        assert count_articles(pg_engine, Article.importance_score.is_(None)) == 0
+        # recency_score and final_score are not stored, so only the response can show them
+        for article in articles_json:
             assert article["recency_score"] is not None
             assert article["final_score"] is not None
 
-    def test_category_is_populated(self, populated_client):
-        articles = populated_client.get("/articles").json()
-        for article in articles:
-            assert article["category"] is not None
-            assert len(article["category"]) > 0
+    def test_category_is_populated(self, ingest_response, pg_engine):
+        assert count_articles(pg_engine) == len(RELEVANT_BATCH) + len(IRRELEVANT_BATCH)
+        assert count_articles(pg_engine, Article.category.is_(None), Article.category == "") == 0
 
-    def test_same_articles_as_retrieve(self, populated_client):
-        retrieve_ids = {a["id"] for a in populated_client.get("/retrieve").json()}
-        articles_ids = {a["id"] for a in populated_client.get("/articles").json()}
+    def test_same_articles_as_retrieve(self, retrieve_json, articles_json):
+        retrieve_ids = {a["id"] for a in retrieve_json}
+        articles_ids = {a["id"] for a in articles_json}
         assert retrieve_ids == articles_ids, \
             "/articles and /retrieve must return the same set of articles"
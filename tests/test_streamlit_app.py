@@ -0,0 +1,84 @@
+"""
+Unit tests for the Streamlit dashboard — the script runs in Streamlit's AppTest harness and its
+pooled httpx client is served from an in-process handler. No API server, no network calls.
+
+Run with: pytest tests/test_streamlit_app.py -v
+"""
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = str(Path(__file__).resolve().parent.parent / "streamlit_app.py")
+
+ARTICLE = {
+    "id": "a1", "source": "ars-technica", "title": "AWS outage", "body": None,
+    "published_at": "2025-01-01T12:00:00Z", "importance_score": 0.8, "recency_score": 1.0,
+    "final_score": 0.8, "category": "system outage or service disruption",
+    "ingested_at": "2025-01-01T12:00:00Z", "url": None,
+}
+
+
+def handle(request: httpx.Request) -> httpx.Response:
+    """Stands in for the API: healthy, one source, one article."""
+    if request.url.path == "/health":
+        return httpx.Response(200, json={"status": "ready"})
+    if request.url.path == "/articles/sources":
+        return httpx.Response(200, json=[ARTICLE["source"]])
+    if request.url.path == "/articles":
+        return httpx.Response(200, json=[ARTICLE])
+    if request.url.path == "/fetch":
+        return httpx.Response(200, json={"status": "ok"})
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def sent_requests():
+    """Runs the dashboard against `handle` and yields the list of requests it sent."""
+    sent = []
+    client_cls = httpx.Client
+
+    def record(request):
+        sent.append(request)
+        return handle(request)
+
+    st.cache_resource.clear()  # the pooled client and API responses are cached process-wide
+    st.cache_data.clear()
+    with patch("httpx.Client", lambda *args, **kwargs: client_cls(transport=httpx.MockTransport(record))):
+        yield sent
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def article_requests(sent) -> list[httpx.Request]:
+    return [r for r in sent if r.url.path == "/articles"]
+
+
+@pytest.fixture
+def app(sent_requests):
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    assert not at.exception
+    return at
+
+
+class TestDashboard:
+    def test_refresh_now_clears_cached_articles(self, app, sent_requests):
+        assert len(article_requests(sent_requests)) == 1
+
+        app.sidebar.button[0].click().run()
+
+        assert not app.exception
+        assert any(r.url.path == "/fetch" for r in sent_requests)
+        assert len(article_requests(sent_requests)) == 2  # the cached response was dropped
+
+    @pytest.mark.parametrize("widget, param", [(0, "categories"), (1, "sources")])
+    def test_cleared_filter_shows_every_article(self, app, sent_requests, widget, param):
+        # As the dashboard's original client-side filter did: an empty selection means no filter
+        app.multiselect[widget].set_value([]).run()
+
+        assert not app.exception
+        assert param not in article_requests(sent_requests)[-1].url.params
+        assert any(caption.value.startswith("**1** articles") for caption in app.caption)
@@ -0,0 +1,91 @@
+import pytest
+import torch
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+from transformers import (
+    BartConfig,
+    BartForSequenceClassification,
+    PreTrainedTokenizerFast,
+    ZeroShotClassificationPipeline,
+)
+
+from app.zero_shot import CachedHypothesisZeroShotPipeline
+
+# Tiny word-level tokenizer and randomly initialised BART, so no model download is needed
+WORDS = "this example is a an the breach outage release news advice discussion major hits region".split()
+LABELS = ["breach", "outage", "major release news", "advice discussion"]
+MAX_LENGTH = 16
+
+
+def make_tokenizer() -> PreTrainedTokenizerFast:
+    vocab = {token: i for i, token in enumerate(["<s>", "<pad>", "</s>", "<unk>", "."] + WORDS)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>",
+        pair="<s> $A </s> </s> $B </s>",
+        special_tokens=[("<s>", vocab["<s>"]), ("</s>", vocab["</s>"])],
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", eos_token="</s>", pad_token="<pad>",
+        unk_token="<unk>", model_max_length=MAX_LENGTH,
+        model_input_names=["input_ids", "attention_mask"],  # as BART's tokenizer; no token_type_ids
+    )
+
+
+@pytest.fixture(scope="module")
+def pipelines():
+    torch.manual_seed(0)
+    tokenizer = make_tokenizer()
+    config = BartConfig(
+        vocab_size=len(tokenizer), d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, pad_token_id=tokenizer.pad_token_id,
+        bos_token_id=tokenizer.bos_token_id, eos_token_id=tokenizer.eos_token_id,
+        label2id={"contradiction": 0, "neutral": 1, "entailment": 2},
+        id2label={0: "contradiction", 1: "neutral", 2: "entailment"},
+    )
+    model = BartForSequenceClassification(config).eval()
+    stock = ZeroShotClassificationPipeline(model=model, tokenizer=tokenizer)
+    cached = CachedHypothesisZeroShotPipeline(model=model, tokenizer=tokenizer)
+    return stock, cached
+
+
+class TestCachedHypothesisPipeline:
+    @pytest.mark.parametrize("text", [
+        "major outage hits region",
+        # Long enough that every pair is truncated, by different amounts per hypothesis length
+        "the breach is a major breach and the outage is a major outage in the region news",
+    ])
+    def test_model_inputs_match_stock_tokenization(self, pipelines, text):
+        stock, cached = pipelines
+
+        expected = list(stock.preprocess(text, candidate_labels=LABELS))
+        actual = list(cached.preprocess(text, candidate_labels=LABELS))
+
+        assert [item["candidate_label"] for item in actual] == LABELS
+        assert [item["is_last"] for item in actual] == [False, False, False, True]
+        for want, got in zip(expected, actual):
+            assert got["input_ids"].tolist() == want["input_ids"].tolist()
+            assert got["attention_mask"].tolist() == want["attention_mask"].tolist()
+
+    def test_hypotheses_encoded_once_across_calls(self, pipelines):
+        _, cached = pipelines
+        cached._hypothesis_encodings.clear()
+
+        cached(["major breach", "news release"], candidate_labels=LABELS)
+        encodings = dict(cached._hypothesis_encodings)
+        cached(["outage hits region"], candidate_labels=LABELS)
+
+        assert len(encodings) == len(LABELS)
+        assert all(cached._hypothesis_encodings[h] is e for h, e in encodings.items())
+
+    def test_scores_match_stock_pipeline(self, pipelines):
+        stock, cached = pipelines
+        texts = ["major outage hits region", "the breach news", "advice discussion"]
+
+        expected = stock(texts, candidate_labels=LABELS, batch_size=len(LABELS))
+        actual = cached(texts, candidate_labels=LABELS, batch_size=len(LABELS))
+
+        for want, got in zip(expected, actual):
+            assert got["labels"] == want["labels"]
+            assert got["scores"] == pytest.approx(want["scores"], abs=1e-6)